@@ -23,12 +23,15 @@ enum CharType as_char_type(char c) {
 }
 
 size_t convert_to_int(char first, char last) {
+  if (first == 0) {
+    return 0;
+  }
   if (last == 0) {
     last = first;
   }
 
-  char c[2] = {first, last};
-  return atoi(c);
+  // not atoi, the two chars aren't null terminated
+  return (size_t)(first - '0') * 10 + (size_t)(last - '0');
 }
 
 int part1(const char *filename) {
@@ -114,9 +117,6 @@ int part2(const char *filename) {
       break;
     case ALPHA:
       switch (tolower(c)) {
-      case 'z':
-        Case(3, "ero", '0');
-        break;
       case 'o':
         Case(2, "ne", '1');
         break;
@@ -155,7 +155,15 @@ int part2(const char *filename) {
 
 #undef Case
 
-int main() {
+int main(int argc, char **argv) {
+  // given a part and a filename, print that part's answer instead of
+  // checking the known ones, this is what python -m aoc2023 --vs-c runs
+  if (argc == 3) {
+    size_t answer = atoi(argv[1]) == 1 ? part1(argv[2]) : part2(argv[2]);
+    printf("%zu\n", answer);
+    return 0;
+  }
+
   size_t sum;
 
   sum = part1("../data/day01_part1_sample.txt");
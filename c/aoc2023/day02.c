@@ -276,7 +276,15 @@ size_t part2(char *filename) {
   return sum;
 }
 
-int main() {
+int main(int argc, char **argv) {
+  // given a part and a filename, print that part's answer instead of
+  // checking the known ones, this is what python -m aoc2023 --vs-c runs
+  if (argc == 3) {
+    size_t answer = atoi(argv[1]) == 1 ? part1(argv[2]) : part2(argv[2]);
+    printf("%zu\n", answer);
+    return 0;
+  }
+
   size_t sum;
 
   sum = part1("../data/day02_sample.txt");
@@ -1,88 +1,237 @@
+import os
 from array import array
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import wraps
+from mmap import ACCESS_READ, mmap
 from os.path import dirname, join, pardir
-from typing import Any, Iterable, Iterator
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
 DATA_DIR = join(dirname(__file__), pardir, pardir, "data")
 
+BACKENDS = ("numpy", "python")
+
+WHITESPACE = frozenset(b" \t\r\n")
+
 
 @dataclass
 class NDArray[T: str | int | float]:
+    """a 2d view over a flat buffer. element (row, col) lives at
+    offset + row * row_stride + col * col_stride, so transposes, flips and
+    rotations only shuffle those numbers and share the buffer with the
+    original. use copy() or contiguous() when a fresh buffer is needed
+
+    grids are kept one byte per cell with typecode "B", each cell holding
+    the ascii code of its symbol. see codes() for the symbol <-> code table
+    """
+
     num_rows: int
     num_cols: int
     _data: array
+    offset: int = 0
+    row_stride: int | None = None
+    col_stride: int = 1
+
+    def __post_init__(self) -> None:
+        if self.row_stride is None:
+            self.row_stride = self.num_cols
+        self._contiguous = (
+            self.offset == 0
+            and self.row_stride == self.num_cols
+            and self.col_stride == 1
+        )
 
     def __repr__(self) -> str:
-        idx = 0
-        lines: list[str] = []
-        for _ in range(self.num_rows):
-            lines.append("".join(map(str, self._data[idx : idx + self.num_cols])))
-            idx += self.num_cols
-        return "\n".join(lines)
+        if self.typecode() == "B":
+            return "\n".join(bytes(row).decode("latin-1") for row in self.iterrows())
+        return "\n".join("".join(map(str, row)) for row in self.iterrows())
+
+    def __eq__(self, other: Any) -> bool:
+        # equal cells, not equal buffers. a transposed copy holds the same
+        # cells as the original with different strides, and rows of mmapped
+        # input come out as bytes rather than arrays
+        if not isinstance(other, NDArray):
+            return NotImplemented
+        if (self.num_rows, self.num_cols) != (other.num_rows, other.num_cols):
+            return False
+        rows = zip(self.iterrows(), other.iterrows())
+        return all(list(mine) == list(theirs) for mine, theirs in rows)
+
+    __hash__ = None  # type: ignore[assignment]
 
     def typecode(self) -> str:
+        if isinstance(self._data, memoryview):
+            return self._data.format
         return self._data.typecode
 
+    def _position(self, item: int) -> int:
+        row, col = divmod(item, self.num_cols)
+        return self.offset + row * self.row_stride + col * self.col_stride  # type: ignore[operator]
+
     def __getitem__(self, item: int) -> T:
-        return self._data[item]
+        if self._contiguous:
+            return self._data[item]
+        return self._data[self._position(item)]
+
+    def __setitem__(self, item: int, value: T) -> None:
+        if self._contiguous:
+            self._data[item] = value
+        else:
+            self._data[self._position(item)] = value
 
     def __len__(self) -> int:
-        return len(self._data)
+        return self.num_rows * self.num_cols
+
+    def _line(self, start: int, step: int, count: int) -> array:
+        stop: int | None = start + step * count
+        # a negative stop would wrap around, None runs to the front instead
+        if stop is not None and stop < 0:
+            stop = None
+        line = self._data[start:stop:step]
+        # copy views of mmapped input so rows always have count and index
+        return bytes(line) if isinstance(line, memoryview) else line
 
     def iterrows(self) -> Iterator[array]:
+        assert self.row_stride is not None
         for row in range(self.num_rows):
-            start = row * self.num_cols
-            stop = start + self.num_cols
-            yield self._data[start:stop:1]
+            start = self.offset + row * self.row_stride
+            yield self._line(start, self.col_stride, self.num_cols)
 
     def itercols(self) -> Iterator[array]:
-        step = self.num_cols
+        assert self.row_stride is not None
         for col in range(self.num_cols):
-            start = col
-            stop = start + self.num_cols * (self.num_rows - 1) + 1
-            yield self._data[start:stop:step]
+            start = self.offset + col * self.col_stride
+            yield self._line(start, self.row_stride, self.num_rows)
+
+    def count(self, value: T) -> int:
+        if self._contiguous:
+            return self._data.count(value)
+        return sum(row.count(value) for row in self.iterrows())
+
+    def row_counts(self, value: T) -> list[int]:
+        return [row.count(value) for row in self.iterrows()]
+
+    def col_counts(self, value: T) -> list[int]:
+        return [col.count(value) for col in self.itercols()]
+
+    def find(self, value: T, start: int = 0) -> int:
+        """index of the first cell at or after start holding value, else -1"""
+        if self._contiguous:
+            try:
+                return self._data.index(value, start)
+            except ValueError:
+                return -1
+
+        row, col = divmod(start, self.num_cols)
+        for idx, line in enumerate(self.iterrows()):
+            if idx < row:
+                continue
+            try:
+                return idx * self.num_cols + line.index(value, col if idx == row else 0)
+            except ValueError:
+                continue
+        return -1
+
+    def nonzero(self) -> list[int]:
+        """indices of the cells that aren't 0, in row-major order"""
+        return [
+            row * self.num_cols + col
+            for row, line in enumerate(self.iterrows())
+            for col, value in enumerate(line)
+            if value
+        ]
+
+    def row_sums(self) -> list[int]:
+        return [sum(row) for row in self.iterrows()]
+
+    def col_sums(self) -> list[int]:
+        return [sum(col) for col in self.itercols()]
+
+    def settle(self, mover: T, empty: T, wall: T) -> "NDArray":
+        """slides every mover as far north as it goes, stopping at walls and
+        other movers. cells are expected to hold one of the three values
+        """
+        typecode = self.typecode()
+        # settled columns laid end to end are the transpose of the result
+        data = array(typecode)
+
+        if typecode == "B":
+            # a byte per cell, so bytes.split finds the runs between walls
+            m, e, w = (bytes([int(value)]) for value in (mover, empty, wall))
+            for col in self.itercols():
+                runs = bytes(col).split(w)
+                data.frombytes(
+                    w.join(m * (n := run.count(m)) + e * (len(run) - n) for run in runs)
+                )
+        else:
+            for col in self.itercols():
+                start = 0
+                walls = [idx for idx, item in enumerate(col) if item == wall]
+                for stop in walls + [len(col)]:
+                    n = col[start:stop].count(mover)
+                    data.extend([mover] * n + [empty] * (stop - start - n))
+                    if stop < len(col):
+                        data.append(wall)
+                    start = stop + 1
+
+        return NDArray(self.num_cols, self.num_rows, data).transpose()
+
+    def _view(
+        self,
+        num_rows: int,
+        num_cols: int,
+        offset: int,
+        row_stride: int,
+        col_stride: int,
+    ) -> "NDArray":
+        return NDArray(num_rows, num_cols, self._data, offset, row_stride, col_stride)
+
+    def copy(self) -> "NDArray":
+        data = array("B" if isinstance(self._data, memoryview) else self.typecode())
+        for row in self.iterrows():
+            data.extend(row)
+        return NDArray(self.num_rows, self.num_cols, data)
+
+    def contiguous(self) -> "NDArray":
+        return self if self._contiguous else self.copy()
 
     def transpose(self) -> "NDArray":
-        num_rows, num_cols = self.num_cols, self.num_rows
-        data = array(
-            self._data.typecode, [item for col in self.itercols() for item in col]
+        assert self.row_stride is not None
+        return self._view(
+            self.num_cols, self.num_rows, self.offset, self.col_stride, self.row_stride
         )
-        return NDArray(num_rows, num_cols, data)
 
     def reverse_rows(self) -> "NDArray":
-        _data = [item for row in self.iterrows() for item in reversed(row)]
-        return NDArray(self.num_rows, self.num_cols, array(self._data.typecode, _data))
+        # every row read right to left
+        assert self.row_stride is not None
+        return self._view(
+            self.num_rows,
+            self.num_cols,
+            self.offset + (self.num_cols - 1) * self.col_stride,
+            self.row_stride,
+            -self.col_stride,
+        )
 
     def reverse_cols(self) -> "NDArray":
-        _data = [item for col in self.itercols() for item in reversed(col)]
-        return NDArray(
-            self.num_cols, self.num_rows, array(self._data.typecode, _data)
-        ).transpose()
-
-    def flip(self) -> "NDArray":
-        _data = self._data
-        _data.reverse()
-        return NDArray(
+        # every column read bottom to top
+        assert self.row_stride is not None
+        return self._view(
             self.num_rows,
             self.num_cols,
-            _data,
+            self.offset + (self.num_rows - 1) * self.row_stride,
+            -self.row_stride,
+            self.col_stride,
         )
 
+    def flip(self) -> "NDArray":
+        return self.reverse_rows().reverse_cols()
+
     def rotate_clockwise(self) -> "NDArray":
-        _data = [item for col in self.itercols() for item in reversed(col)]
-        return NDArray(
-            self.num_cols,
-            self.num_rows,
-            array(self._data.typecode, _data),
-        )
+        return self.reverse_cols().transpose()
 
     def rotate_counterclockwise(self) -> "NDArray":
-        _data = [item for col in self.iterrows() for item in reversed(col)]
-        return NDArray(
-            self.num_rows,
-            self.num_cols,
-            array(self._data.typecode, _data),
-        ).transpose()
+        return self.reverse_rows().transpose()
 
     def idx_to_row_col(self, idx: int) -> tuple[int, int]:
         row, col = divmod(idx, self.num_cols)
@@ -96,16 +245,52 @@ class NDArray[T: str | int | float]:
         return row * self.num_cols + col
 
 
-@dataclass
+_backend = os.environ.get("AOC2023_BACKEND", "numpy")
+
+
+def set_backend(name: str) -> None:
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name}, must be one of {BACKENDS}")
+
+    global _backend
+    _backend = name
+
+
+def get_backend() -> str:
+    """the backend make_ndarray will use, numpy only when it's importable"""
+    if _backend == "numpy":
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return "python"
+    return _backend
+
+
+def make_ndarray(num_rows: int, num_cols: int, data: array) -> NDArray:
+    """an NDArray from the configured backend. both serve the same api, the
+    numpy one vectorises the whole-grid operations (settle, rotations, counts
+    and sums) but is slower for scalar indexing, so days that walk a grid
+    cell by cell should build an NDArray directly
+    """
+    if get_backend() == "numpy":
+        from aoc2023.numpy_backend import NumpyNDArray
+
+        return NumpyNDArray.from_array(num_rows, num_cols, data)
+    return NDArray(num_rows, num_cols, data)
+
+
+@dataclass(frozen=True, slots=True)
 class Range:
     start: int
     end: int
-    label: str | None = None
+    label: str | None = field(default=None, compare=False)
 
     def __post_init__(self):
         # assert ranges are increasing
         if self.end < self.start:
-            self.start, self.end = self.end, self.start
+            start, end = self.end, self.start
+            object.__setattr__(self, "start", start)
+            object.__setattr__(self, "end", end)
 
     def intersection(self, other: "Range") -> "Range | None":
         if not self.intersects(other):
@@ -124,6 +309,11 @@ class Range:
             raise ValueError("cannot split with external point")
         return [Range(self.start, value), Range(value + 1, self.end)]
 
+    def split_at(self, value: int) -> tuple["Range", "Range"]:
+        """the half-open pieces below value and from value on, either may be empty"""
+        value = min(max(value, self.start), self.end)
+        return Range(self.start, value), Range(value, self.end)
+
     def contains(self, other: "Range") -> bool:
         return other.start >= self.start and other.end <= self.end
 
@@ -157,18 +347,356 @@ class Range:
                 Range(intersection.end, self.end),
             ]
 
-    def __eq__(self, other: Any) -> bool:
-        if isinstance(other, Range):
-            return self.start == other.start and self.end == other.end
-        else:
-            raise NotImplementedError("cannot equate Range with another type")
-
-    def __ne__(self, other: Any) -> bool:
-        return not self.__eq__(other)
-
     def __len__(self) -> int:
         return self.end - self.start
 
-    def __iter__(self) -> Iterable[int]:
+    def __iter__(self) -> Iterator[int]:
         for _ in range(self.start, self.end):
             yield _
+
+
+# (start, end, offset): values in [start, end) move by offset
+Segment = tuple[int, int, int]
+
+
+class RangeSet:
+    """sorted, disjoint half-open intervals [start, end) that are coalesced
+    whenever they touch. starts and ends live in parallel arrays so point
+    lookups are a bisect and set operations are a merge of two sorted lists
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[Range | tuple[int, int]] = ()) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+
+        pairs = sorted(
+            (r.start, r.end) if isinstance(r, Range) else (r[0], r[1]) for r in ranges
+        )
+        for start, end in pairs:
+            self._append(start, end)
+
+    @classmethod
+    def _from_sorted(cls, pairs: Iterable[tuple[int, int]]) -> "RangeSet":
+        # skips the sort when the caller already produces pairs in order
+        result = cls()
+        for start, end in pairs:
+            result._append(start, end)
+        return result
+
+    def _append(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        if self.ends and start <= self.ends[-1]:
+            self.ends[-1] = max(self.ends[-1], end)
+        else:
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def __repr__(self) -> str:
+        pairs = ", ".join(f"[{s}, {e})" for s, e in zip(self.starts, self.ends))
+        return f"RangeSet({pairs})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __len__(self) -> int:
+        """the number of intervals, see size for the number of values"""
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __iter__(self) -> Iterator[Range]:
+        for start, end in zip(self.starts, self.ends):
+            yield Range(start, end)
+
+    def __contains__(self, value: int) -> bool:
+        idx = bisect_right(self.starts, value) - 1
+        return idx >= 0 and value < self.ends[idx]
+
+    def size(self) -> int:
+        return sum(self.ends) - sum(self.starts)
+
+    def clip(self, start: int, end: int) -> Iterator[tuple[int, int]]:
+        """the pieces of the set inside [start, end), in order"""
+        idx = bisect_right(self.ends, start)
+        while idx < len(self.starts) and self.starts[idx] < end:
+            yield max(self.starts[idx], start), min(self.ends[idx], end)
+            idx += 1
+
+    def min(self) -> int:
+        if not self.starts:
+            raise ValueError("min of an empty RangeSet")
+        return self.starts[0]
+
+    def _merge(self, other: "RangeSet") -> Iterator[tuple[int, int]]:
+        # both sides are sorted by start, so a two-way merge keeps the order
+        i = j = 0
+        while i < len(self.starts) or j < len(other.starts):
+            if j == len(other.starts) or (
+                i < len(self.starts) and self.starts[i] <= other.starts[j]
+            ):
+                yield self.starts[i], self.ends[i]
+                i += 1
+            else:
+                yield other.starts[j], other.ends[j]
+                j += 1
+
+    def union(self, other: "RangeSet") -> "RangeSet":
+        return RangeSet._from_sorted(self._merge(other))
+
+    def intersection(self, other: "RangeSet") -> "RangeSet":
+        pairs: list[tuple[int, int]] = []
+        i = j = 0
+        while i < len(self.starts) and j < len(other.starts):
+            start = max(self.starts[i], other.starts[j])
+            end = min(self.ends[i], other.ends[j])
+            if start < end:
+                pairs.append((start, end))
+            # whichever interval finishes first can't overlap anything else
+            if self.ends[i] < other.ends[j]:
+                i += 1
+            else:
+                j += 1
+        return RangeSet._from_sorted(pairs)
+
+    def difference(self, other: "RangeSet") -> "RangeSet":
+        pairs: list[tuple[int, int]] = []
+        j = 0
+        for start, end in zip(self.starts, self.ends):
+            # skip what ends before this interval, then cut out the rest
+            while j < len(other.starts) and other.ends[j] <= start:
+                j += 1
+            k = j
+            while k < len(other.starts) and other.starts[k] < end:
+                if start < other.starts[k]:
+                    pairs.append((start, other.starts[k]))
+                start = max(start, other.ends[k])
+                k += 1
+            if start < end:
+                pairs.append((start, end))
+        return RangeSet._from_sorted(pairs)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def shift(self, segments: Sequence[Segment]) -> "RangeSet":
+        """moves each value by the offset of the segment it falls in, values
+        outside every segment stay put. segments must be sorted and disjoint
+        """
+        seg_starts = [segment[0] for segment in segments]
+
+        pairs: list[tuple[int, int]] = []
+        for start, end in zip(self.starts, self.ends):
+            idx = max(bisect_right(seg_starts, start) - 1, 0)
+            while start < end:
+                if idx == len(segments):
+                    pairs.append((start, end))
+                    break
+
+                seg_start, seg_end, offset = segments[idx]
+                if start < seg_start:
+                    # the gap before the next segment maps to itself
+                    stop = min(end, seg_start)
+                    pairs.append((start, stop))
+                elif start < seg_end:
+                    stop = min(end, seg_end)
+                    pairs.append((start + offset, stop + offset))
+                    idx += 1
+                else:
+                    idx += 1
+                    continue
+                start = stop
+
+        return RangeSet(pairs)
+
+
+def codes(symbols: str) -> tuple[int, ...]:
+    """the byte codes a compact grid stores for each symbol, e.g.
+    EMPTY, ROCK = codes(".#")
+    """
+    return tuple(symbols.encode("ascii"))
+
+
+def symbols(codes: Iterable[int]) -> str:
+    return bytes(codes).decode("ascii")
+
+
+@dataclass(frozen=True)
+class Grid:
+    """a rectangular view over the raw bytes of an input, the first row
+    starts at `start` and rows are `stride` bytes apart since each one still
+    ends in its newline. data is the Input's own memoryview, so a grid
+    doesn't keep the file mapped, but it's only usable while the Input is
+    open
+    """
+
+    data: memoryview
+    start: int
+    num_rows: int
+    num_cols: int
+    stride: int
+
+    def __getitem__(self, item: tuple[int, int]) -> int:
+        row, col = item
+        return self.data[self.start + row * self.stride + col]
+
+    def row(self, row: int) -> memoryview:
+        start = self.start + row * self.stride
+        return self.data[start : start + self.num_cols]
+
+    def iterrows(self) -> Iterator[memoryview]:
+        for row in range(self.num_rows):
+            yield self.row(row)
+
+    def to_array(self, typecode: str = "B") -> array:
+        # the one copy the grid days need, dropping the newlines on the way
+        flat = b"".join(self.iterrows())
+        if typecode == "u":
+            return array(typecode, flat.decode("ascii"))
+        return array(typecode, flat)
+
+    def to_ndarray(self, typecode: str = "B") -> NDArray:
+        return NDArray(self.num_rows, self.num_cols, self.to_array(typecode))
+
+    def view(self) -> NDArray[int]:
+        # no copy at all, the newlines are skipped over by the row stride
+        return NDArray(self.num_rows, self.num_cols, self.data, self.start, self.stride)
+
+
+class Input:
+    """memory-maps a file in DATA_DIR and hands out memoryview slices of it.
+    splitting into lines, paragraphs or a grid copies nothing, the bytes are
+    only copied when a day turns a slice into whatever it parses. leading
+    and trailing whitespace is ignored, like the old .strip() calls, and
+    \r\n line endings are handled like \n
+
+    use it as a context manager, everything a day keeps has to be copied out
+    before the end of the block, which closes the mapping:
+
+        with Input(filename) as data:
+            sections = [bytes(section) for section in data.paragraphs()]
+    """
+
+    def __init__(self, filename: str) -> None:
+        with open(join(DATA_DIR, filename), "rb") as fh:
+            try:
+                self._map: mmap | bytes = mmap(fh.fileno(), 0, access=ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                self._map = b""
+
+        self.data = memoryview(self._map)
+
+        start, stop = 0, len(self._map)
+        while start < stop and self._map[start] in WHITESPACE:
+            start += 1
+        while stop > start and self._map[stop - 1] in WHITESPACE:
+            stop -= 1
+        self.start, self.stop = start, stop
+
+        # the first line ending decides for the whole file
+        first = self._map.find(b"\n", start, stop)
+        crlf = first > start and self._map[first - 1] == ord("\r")
+        self.newline = b"\r\n" if crlf else b"\n"
+
+    def __enter__(self) -> "Input":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """raises BufferError if a slice of the input is still alive"""
+        self.data.release()
+        if isinstance(self._map, mmap):
+            self._map.close()
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.data[self.start : self.stop])
+
+    def spans(self, sep: bytes) -> Iterator[tuple[int, int]]:
+        start = self.start
+        while start <= self.stop:
+            stop = self._map.find(sep, start, self.stop)
+            if stop == -1:
+                stop = self.stop
+            yield start, stop
+            start = stop + len(sep)
+
+    def split(self, sep: bytes) -> Iterator[memoryview]:
+        for start, stop in self.spans(sep):
+            yield self.data[start:stop]
+
+    def lines(self) -> Iterator[memoryview]:
+        return self.split(self.newline)
+
+    def paragraphs(self) -> Iterator[memoryview]:
+        return self.split(self.newline * 2)
+
+    def grid(self) -> Grid:
+        num_cols = self._map.find(self.newline, self.start, self.stop)
+        num_cols = len(self) if num_cols == -1 else num_cols - self.start
+        stride = num_cols + len(self.newline)
+
+        num_rows, ragged = divmod(len(self) + len(self.newline), stride)
+        if ragged:
+            raise ValueError("grid rows must all have the same length")
+
+        return Grid(self.data, self.start, num_rows, num_cols, stride)
+
+
+@dataclass
+class HotPath:
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+
+
+HOT_PATHS: dict[str, HotPath] = {}
+
+_hot_paths_enabled = bool(os.environ.get("AOC2023_HOT_PATHS"))
+
+
+def enable_hot_paths(enabled: bool = True) -> None:
+    """only affects functions decorated after this, so call it before
+    importing the day modules
+    """
+    global _hot_paths_enabled
+    _hot_paths_enabled = enabled
+
+
+def reset_hot_paths() -> None:
+    for stats in HOT_PATHS.values():
+        stats.calls, stats.seconds = 0, 0.0
+
+
+def hot_path[**P, R](fn: Callable[P, R]) -> Callable[P, R]:
+    """counts calls to fn and the time spent in them (including recursive
+    calls) into HOT_PATHS. time spent consuming a returned iterator isn't
+    included. when hot paths are disabled fn is returned as is, so marking a
+    function costs nothing
+    """
+    if not _hot_paths_enabled:
+        return fn
+
+    name = f"{fn.__module__.rpartition('.')[2]}.{fn.__qualname__}"
+    stats = HOT_PATHS.setdefault(name, HotPath(name))
+
+    @wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.calls += 1
+            stats.seconds += perf_counter() - start
+
+    return wrapper
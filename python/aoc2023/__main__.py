@@ -0,0 +1,362 @@
+from argparse import ArgumentParser, Namespace
+from itertools import groupby
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import ModuleType
+
+from aoc2023 import (
+    BACKENDS,
+    bench,
+    cache,
+    enable_hot_paths,
+    generate,
+    get_backend,
+    runner,
+    set_backend,
+)
+from aoc2023.runner import CASES, Case, discover, select
+
+
+def parse_args(argv: list[str] | None = None) -> Namespace:
+    parser = ArgumentParser(
+        prog="python -m aoc2023",
+        description="run every day in one process and time each part",
+    )
+    parser.add_argument(
+        "-d", "--day", type=int, action="append", help="only run this day, repeatable"
+    )
+    parser.add_argument(
+        "-p",
+        "--part",
+        type=int,
+        choices=(1, 2),
+        action="append",
+        help="only run this part",
+    )
+
+    inputs = parser.add_mutually_exclusive_group()
+    inputs.add_argument(
+        "--sample",
+        dest="sample",
+        action="store_const",
+        const=True,
+        default=None,
+        help="only run the sample inputs",
+    )
+    inputs.add_argument(
+        "--real",
+        dest="sample",
+        action="store_const",
+        const=False,
+        help="only run the real inputs",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="run parts in this many processes, slowest first (default: 1)",
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="PATH",
+        default=runner.TIMINGS_FILE,
+        help="where the last cpu times are kept for scheduling "
+        "(default: .timings.json)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="parse every input on every call instead of reusing parsed inputs",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        default=cache.settings()[1],
+        help="also keep parsed inputs on disk so they survive between runs "
+        "(default: $AOC2023_CACHE_DIR)",
+    )
+
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=get_backend(),
+        help="array backend for the grid days (default: $AOC2023_BACKEND or numpy "
+        "when it is installed)",
+    )
+
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="write a cProfile .prof and a collapsed-stack .folded file per part "
+        "into DIR and report the @hot_path counters",
+    )
+    profiling.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace allocations and report each part's peak memory",
+    )
+    profiling.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="allocation sites to show per part with --memory (default: 5)",
+    )
+    profiling.add_argument(
+        "--memory-budget",
+        action="append",
+        metavar="[NAME=]MB",
+        help="fail a part whose traced peak is over this, either for every part "
+        "or for one, e.g. day21.part2=500, repeatable",
+    )
+
+    benchmarking = parser.add_argument_group("benchmarking")
+    benchmarking.add_argument(
+        "--bench", action="store_true", help="time each part repeatedly"
+    )
+    benchmarking.add_argument(
+        "--repeat", type=int, default=5, help="timed runs per part (default: 5)"
+    )
+    benchmarking.add_argument(
+        "--warmup", type=int, default=1, help="untimed runs per part (default: 1)"
+    )
+    benchmarking.add_argument(
+        "--save", metavar="PATH", help="write the benchmark results as json"
+    )
+    benchmarking.add_argument(
+        "--baseline", metavar="PATH", help="compare against saved benchmark results"
+    )
+    benchmarking.add_argument(
+        "--threshold",
+        action="append",
+        metavar="[NAME=]PCT",
+        help="allowed slowdown against the baseline in percent, either the default "
+        "or for one part, e.g. day16.part2=15, repeatable (default: 10)",
+    )
+
+    benchmarking.add_argument(
+        "--vs-c",
+        action="store_true",
+        help="build the c solutions and time them against python on the real and "
+        "generated inputs, checking the answers agree",
+    )
+    benchmarking.add_argument(
+        "--sweep",
+        action="store_true",
+        help="time each part on generated inputs of growing size and fit the "
+        "growth rate, see aoc2023/generate.py",
+    )
+    benchmarking.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        metavar="N,N,...",
+        help="sizes for --sweep instead of each day's defaults",
+    )
+    benchmarking.add_argument(
+        "--seed",
+        type=int,
+        default=generate.DEFAULT_SEED,
+        help=f"seed for the generated inputs (default: {generate.DEFAULT_SEED})",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.vs_c and (args.bench or args.sweep or args.jobs > 1):
+        parser.error("--vs-c runs serially on its own")
+    if args.sweep and (args.bench or args.jobs > 1 or args.sample is not None):
+        parser.error("--sweep runs serially on generated inputs only")
+    if args.bench and args.jobs > 1:
+        parser.error("--bench runs serially, parallel runs would skew the timings")
+    if args.profile is not None and (args.bench or args.jobs > 1 or args.memory):
+        parser.error("--profile runs on its own, without --bench, --jobs or --memory")
+    if args.memory and (args.bench or args.jobs > 1):
+        parser.error("--memory runs on its own, without --bench or --jobs")
+
+    return args
+
+
+def run_timings(
+    args: Namespace, modules: dict[int, ModuleType], cases: list[Case]
+) -> int:
+    if args.jobs > 1:
+        timings = runner.load_timings(args.timings)
+        results = runner.run_parallel(cases, args.jobs, timings)
+    else:
+        results = runner.run(modules, cases)
+
+    start = perf_counter()
+
+    done: list[runner.Result] = []
+    print(runner.format_header())
+    for result in results:
+        print(runner.format_result(result), flush=True)
+        done.append(result)
+
+    elapsed = perf_counter() - start
+    total = sum(result.wall for result in done)
+    print(f"\n{len(done)} parts, {total:.4f}s of work in {elapsed:.4f}s")
+
+    runner.save_timings(done, args.timings)
+
+    return 1 if any(not result.ok for result in done) else 0
+
+
+def run_bench(
+    args: Namespace, modules: dict[int, ModuleType], cases: list[Case]
+) -> int:
+    benchmarks: list[bench.Benchmark] = []
+
+    print(bench.format_header())
+    for b in bench.benchmark(modules, cases, args.repeat, args.warmup):
+        print(bench.format_benchmark(b), flush=True)
+        benchmarks.append(b)
+
+    if args.save is not None:
+        bench.save(args.save, benchmarks, args.repeat, args.warmup)
+
+    failed = sum(not b.ok for b in benchmarks)
+
+    if args.baseline is not None:
+        baseline = bench.load(args.baseline)
+        thresholds = bench.parse_thresholds(args.threshold)
+
+        print()
+        for comparison in bench.compare(benchmarks, baseline, thresholds):
+            print(bench.format_comparison(comparison))
+            failed += comparison.regressed
+
+    return 1 if failed else 0
+
+
+def run_sweep(args: Namespace, modules: dict[int, ModuleType]) -> int:
+    # parsed inputs are only used once, caching them would just add pickling
+    cache.configure(False)
+
+    days = sorted(generate.GENERATORS)
+    if args.day is not None:
+        days = [day for day in days if day in args.day]
+
+    print(bench.format_sweep_header())
+    with TemporaryDirectory() as directory:
+        for day in days:
+            generator = generate.GENERATORS[day]
+            sizes = args.sizes or generator.sizes
+
+            points: list[bench.SweepPoint] = []
+            for point in bench.sweep(
+                modules, day, sizes, directory, args.part, args.seed
+            ):
+                print(bench.format_sweep_point(point), flush=True)
+                points.append(point)
+
+            for name, group in groupby(
+                sorted(points, key=lambda point: point.result.case.name),
+                key=lambda point: point.result.case.name,
+            ):
+                exponent = bench.fit_growth(group)
+                print(bench.format_growth(name, generator.unit, exponent))
+            print()
+
+    return 0
+
+
+def run_vs_c(args: Namespace, modules: dict[int, ModuleType]) -> int:
+    from aoc2023 import crosslang
+
+    # the c binaries parse on every run, so python has to as well
+    cache.configure(False)
+
+    days = args.day or crosslang.C_DAYS
+    for day in sorted(set(days) - set(crosslang.C_DAYS)):
+        print(f"day{day:02} has no c solution to compare against")
+    days = [day for day in crosslang.C_DAYS if day in days]
+    parts = args.part or (1, 2)
+
+    mismatches = 0
+    print(crosslang.format_header())
+    with TemporaryDirectory() as directory:
+        binaries = {day: crosslang.build(day, directory) for day in days}
+        cases = crosslang.cases(days, parts, args.sizes, directory)
+        for result in crosslang.compare(
+            modules, binaries, cases, args.repeat, args.warmup
+        ):
+            print(crosslang.format_result(result), flush=True)
+            mismatches += not result.agree
+
+    return 1 if mismatches else 0
+
+
+def run_profile(
+    args: Namespace, modules: dict[int, ModuleType], cases: list[Case]
+) -> int:
+    # imported here so a normal run doesn't load cProfile and threading
+    from aoc2023 import profiling
+
+    failed = 0
+    print(runner.format_header())
+    for case in cases:
+        result, stem = profiling.profile_case(modules, case, args.profile)
+        print(runner.format_result(result), flush=True)
+        for line in profiling.format_hot_paths():
+            print(line)
+        print(f"  wrote {stem}.prof and {stem}.folded")
+        failed += not result.ok
+
+    return 1 if failed else 0
+
+
+def run_memory(
+    args: Namespace, modules: dict[int, ModuleType], cases: list[Case]
+) -> int:
+    from aoc2023 import profiling
+
+    budgets = profiling.parse_budgets(args.memory_budget)
+
+    failed = 0
+    print(runner.format_header())
+    for case in cases:
+        report = profiling.measure_memory(modules, case, args.top)
+        budget = profiling.get_budget(budgets, case)
+        print(runner.format_result(report.result), flush=True)
+        for line in profiling.format_memory(report, budget):
+            print(line)
+        failed += not report.result.ok
+        failed += budget is not None and report.peak > budget
+
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    cache.configure(args.cache, args.cache_dir)
+    set_backend(args.backend)
+    if args.profile is not None:
+        # before discover, since @hot_path only wraps when enabled at import
+        enable_hot_paths()
+
+    modules = discover()
+    cases = select(CASES, days=args.day, parts=args.part, sample=args.sample)
+
+    if args.profile is not None:
+        return run_profile(args, modules, cases)
+    elif args.memory:
+        return run_memory(args, modules, cases)
+    elif args.sweep:
+        return run_sweep(args, modules)
+    elif args.vs_c:
+        return run_vs_c(args, modules)
+    elif args.bench:
+        return run_bench(args, modules, cases)
+    else:
+        return run_timings(args, modules, cases)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+import json
+import os
+import platform
+from dataclasses import dataclass
+from math import log
+from statistics import fmean, median, quantiles, stdev
+from types import ModuleType
+from typing import Any, Iterable, Iterator
+
+from aoc2023 import generate
+from aoc2023.runner import Case, Result, run_case
+
+DEFAULT_THRESHOLD = 0.10
+
+
+@dataclass(frozen=True)
+class Stats:
+    runs: tuple[float, ...]
+
+    @property
+    def min(self) -> float:
+        return min(self.runs)
+
+    @property
+    def median(self) -> float:
+        return median(self.runs)
+
+    @property
+    def mean(self) -> float:
+        return fmean(self.runs)
+
+    @property
+    def p95(self) -> float:
+        if len(self.runs) < 2:
+            return self.runs[0]
+        return quantiles(self.runs, n=20, method="inclusive")[-1]
+
+    @property
+    def stddev(self) -> float:
+        return stdev(self.runs) if len(self.runs) > 1 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "min": self.min,
+            "median": self.median,
+            "mean": self.mean,
+            "p95": self.p95,
+            "stddev": self.stddev,
+            "runs": list(self.runs),
+        }
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    case: Case
+    stats: Stats
+    ok: bool
+
+
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else 1.0
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio > 1 + self.threshold
+
+
+def benchmark_case(
+    modules: dict[int, ModuleType], case: Case, repeat: int, warmup: int
+) -> Benchmark:
+    assert repeat >= 1
+    assert warmup >= 0
+
+    ok = True
+    for _ in range(warmup):
+        ok &= run_case(modules, case).ok
+
+    runs: list[float] = []
+    for _ in range(repeat):
+        result = run_case(modules, case)
+        ok &= result.ok
+        runs.append(result.wall)
+
+    return Benchmark(case, Stats(tuple(runs)), ok)
+
+
+def benchmark(
+    modules: dict[int, ModuleType], cases: Iterable[Case], repeat: int, warmup: int
+) -> Iterator[Benchmark]:
+    for case in cases:
+        yield benchmark_case(modules, case, repeat, warmup)
+
+
+def save(path: str, benchmarks: Iterable[Benchmark], repeat: int, warmup: int) -> None:
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": {b.case.key: b.stats.to_dict() for b in benchmarks},
+    }
+    with open(path, "w") as fh:
+        json.dump(data, fh, indent=2)
+        fh.write("\n")
+
+
+def load(path: str) -> dict[str, dict[str, Any]]:
+    with open(path, "r") as fh:
+        return json.load(fh)["results"]
+
+
+def parse_thresholds(values: Iterable[str] | None) -> dict[str, float]:
+    """thresholds are percentages, either bare ("10") to set the default or
+    scoped to a part or a single case ("day16.part2=15")
+    """
+    thresholds = {"": DEFAULT_THRESHOLD}
+    for value in values or ():
+        name, _, pct = value.rpartition("=")
+        thresholds[name] = float(pct) / 100
+    return thresholds
+
+
+def get_threshold(thresholds: dict[str, float], case: Case) -> float:
+    for name in (case.key, case.name):
+        if name in thresholds:
+            return thresholds[name]
+    return thresholds[""]
+
+
+def compare(
+    benchmarks: Iterable[Benchmark],
+    baseline: dict[str, dict[str, Any]],
+    thresholds: dict[str, float],
+) -> Iterator[Comparison]:
+    # compare medians, min is too optimistic and mean too noisy for gating
+    for b in benchmarks:
+        if b.case.key not in baseline:
+            continue
+        yield Comparison(
+            b.case.key,
+            baseline[b.case.key]["median"],
+            b.stats.median,
+            get_threshold(thresholds, b.case),
+        )
+
+
+def format_header() -> str:
+    return f"{'case':<46} {'min':>9} {'median':>9} {'p95':>9} {'stddev':>9}"
+
+
+def format_benchmark(b: Benchmark) -> str:
+    s = b.stats
+    status = "" if b.ok else "  FAIL"
+    return (
+        f"{b.case.key:<46} {s.min:>9.4f} {s.median:>9.4f} "
+        f"{s.p95:>9.4f} {s.stddev:>9.4f}{status}"
+    )
+
+
+def format_comparison(c: Comparison) -> str:
+    status = "REGRESSION" if c.regressed else "ok"
+    return (
+        f"{c.key:<46} {c.baseline:>9.4f} -> {c.current:>9.4f} "
+        f"{100 * (c.ratio - 1):>+7.1f}% (limit +{100 * c.threshold:.0f}%) {status}"
+    )
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    size: int
+    result: Result
+
+
+def sweep(
+    modules: dict[int, ModuleType],
+    day: int,
+    sizes: Iterable[int],
+    directory: str,
+    parts: Iterable[int] | None = None,
+    seed: int = generate.DEFAULT_SEED,
+) -> Iterator[SweepPoint]:
+    generator = generate.GENERATORS[day]
+    parts = None if parts is None else set(parts)
+
+    for size in sizes:
+        path = generate.write(directory, day, size, seed)
+        for case in generator.cases(path, size):
+            if parts is None or case.part in parts:
+                yield SweepPoint(size, run_case(modules, case))
+        os.remove(path)
+
+
+def fit_growth(points: Iterable[SweepPoint]) -> float | None:
+    """the exponent k in time ~ size**k, a least squares fit on log-log axes"""
+    xs, ys = [], []
+    for point in points:
+        if point.result.wall > 0:
+            xs.append(log(point.size))
+            ys.append(log(point.result.wall))
+
+    if len(set(xs)) < 2:
+        return None
+
+    x_mean, y_mean = fmean(xs), fmean(ys)
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return covariance / variance
+
+
+def format_sweep_header() -> str:
+    return f"{'part':<12} {'size':>12} {'wall (s)':>9}  {'answer':<18}"
+
+
+def format_sweep_point(point: SweepPoint) -> str:
+    return (
+        f"{point.result.case.name:<12} {point.size:>12} "
+        f"{point.result.wall:>9.4f}  {point.result.answer!s:<18}"
+    )
+
+
+def format_growth(name: str, unit: str, exponent: float | None) -> str:
+    if exponent is None:
+        return f"{name:<12} growth unknown, needs at least two sizes"
+    return f"{name:<12} time ~ n^{exponent:.2f}, n = {unit}"
@@ -0,0 +1,121 @@
+import os
+import subprocess
+from dataclasses import dataclass
+from os.path import dirname, join, pardir
+from time import perf_counter
+from types import ModuleType
+from typing import Iterable, Iterator
+
+from aoc2023 import DATA_DIR, generate
+from aoc2023.bench import Stats, benchmark_case
+from aoc2023.runner import Case, run_case
+
+C_DIR = join(dirname(__file__), pardir, pardir, "c", "aoc2023")
+
+# day03.c only parses the sample so far, so there's nothing to compare
+C_DAYS = (1, 2)
+
+
+@dataclass(frozen=True)
+class CrossResult:
+    case: Case
+    python: Stats
+    c: Stats
+    python_answer: int
+    c_answer: int
+
+    @property
+    def agree(self) -> bool:
+        return self.python_answer == self.c_answer
+
+    @property
+    def ratio(self) -> float:
+        return self.python.median / self.c.median if self.c.median > 0 else 0.0
+
+
+def build(day: int, directory: str) -> str:
+    """compiles the day with optimisations on, $CC picks the compiler"""
+    source = join(C_DIR, f"day{day:02}.c")
+    binary = join(directory, f"day{day:02}")
+    cc = os.environ.get("CC", "cc")
+    subprocess.run([cc, "-O2", "-Wall", source, "-o", binary], check=True)
+    return binary
+
+
+def run_c(binary: str, part: int, path: str) -> tuple[int, float]:
+    # includes process start up, which is only noticeable on tiny inputs
+    start = perf_counter()
+    completed = subprocess.run(
+        [binary, str(part), path], check=True, capture_output=True, text=True
+    )
+    return int(completed.stdout), perf_counter() - start
+
+
+def benchmark_c(binary: str, case: Case, repeat: int, warmup: int) -> tuple[int, Stats]:
+    path = join(DATA_DIR, case.args[0])
+
+    for _ in range(warmup):
+        run_c(binary, case.part, path)
+
+    answers, runs = set(), []
+    for _ in range(repeat):
+        answer, wall = run_c(binary, case.part, path)
+        answers.add(answer)
+        runs.append(wall)
+
+    assert len(answers) == 1, f"{binary} gave different answers: {answers}"
+    return answers.pop(), Stats(tuple(runs))
+
+
+def cases(
+    days: Iterable[int],
+    parts: Iterable[int],
+    sizes: Iterable[int] | None,
+    directory: str,
+) -> Iterator[Case]:
+    """the real input for each day plus generated ones, by default at the
+    largest size a sweep would use
+    """
+    for day in days:
+        generator = generate.GENERATORS[day]
+        paths = [f"day{day:02}.txt"]
+        for size in sizes or generator.sizes[-1:]:
+            paths.append(generate.write(directory, day, size))
+
+        for path in paths:
+            for part in parts:
+                yield Case(day, part, (path,), sample=False)
+
+
+def compare(
+    modules: dict[int, ModuleType],
+    binaries: dict[int, str],
+    cases: Iterable[Case],
+    repeat: int,
+    warmup: int,
+) -> Iterator[CrossResult]:
+    for case in cases:
+        c_answer, c_stats = benchmark_c(binaries[case.day], case, repeat, warmup)
+
+        # benchmark_case only keeps timings, so get the answer separately
+        python_answer = run_case(modules, case).answer
+        python = benchmark_case(modules, case, repeat, warmup)
+
+        yield CrossResult(case, python.stats, c_stats, python_answer, c_answer)
+
+
+def format_header() -> str:
+    return (
+        f"{'part':<12} {'input':<28} {'python (s)':>10} {'c (s)':>10} "
+        f"{'ratio':>8}  {'answer':<18}"
+    )
+
+
+def format_result(result: CrossResult) -> str:
+    case = result.case
+    status = "ok" if result.agree else f"MISMATCH (c gave {result.c_answer})"
+    return (
+        f"{case.name:<12} {os.path.basename(case.args[0]):<28} "
+        f"{result.python.median:>10.4f} {result.c.median:>10.4f} "
+        f"{result.ratio:>7.1f}x  {result.python_answer!s:<18} {status}"
+    )
@@ -1,71 +1,61 @@
-import string
+import re
 from os.path import join
+from typing import BinaryIO, Iterable, Iterator
 
 from aoc2023 import DATA_DIR
 
+WORDS = tuple(b"one two three four five six seven eight nine".split())
 
-def read_data(filename: str) -> list[str]:
-    with open(join(DATA_DIR, filename)) as fh:
-        return fh.read().split("\n")
+VALUES: dict[bytes, int] = {str(value).encode(): value for value in range(1, 10)}
+VALUES |= {word: value for value, word in enumerate(WORDS, start=1)}
+VALUES |= {word[::-1]: value for word, value in list(VALUES.items())}
+
+# the last token in a line is the first one in the reversed line, so both
+# ends are a single regex search that stops at its first hit
+DIGIT = re.compile(rb"[1-9]")
+TOKEN = re.compile(b"[1-9]|" + b"|".join(WORDS))
+TOKEN_REVERSED = re.compile(b"[1-9]|" + b"|".join(word[::-1] for word in WORDS))
+
+
+def calibration_value(line: bytes, spelled: bool = False) -> int | None:
+    forward, backward = (TOKEN, TOKEN_REVERSED) if spelled else (DIGIT, DIGIT)
+
+    first = forward.search(line)
+    if first is None:
+        return None
+    last = backward.search(line[::-1])
+    assert last is not None
+
+    return 10 * VALUES[first.group()] + VALUES[last.group()]
+
+
+def calibration_values(lines: Iterable[bytes], spelled: bool = False) -> Iterator[int]:
+    """one value per line that has a digit in it, the lines can come from
+    any stream so nothing is held beyond the current line
+    """
+    for line in lines:
+        value = calibration_value(line, spelled)
+        if value is not None:
+            yield value
+
+
+def calibrate(fh: BinaryIO, spelled: bool = False) -> int:
+    return sum(calibration_values(fh, spelled))
 
 
 def part1(filename: str) -> int:
-    data = read_data(filename)
-
-    digits = []
-    for line in data:
-        if line == "":
-            continue
-
-        current_digits = "".join([c if c in string.digits else "" for c in line])
-        digits.append(int(f"{current_digits[0]}{current_digits[-1]}"))
-
-    return sum(digits)
-
-
-def part2(filename) -> int:
-    data = read_data(filename)
-
-    digits = []
-    for line in data:
-        if line == "":
-            continue
-
-        current_digits = []
-        current_length = len(line)
-
-        for idx, c in enumerate(line):
-            if c in string.digits:
-                current_digits.append(int(c))
-            elif c == "o":
-                if idx + 3 <= current_length and line[idx : idx + 3] == "one":
-                    current_digits.append(1)
-            elif c == "t":
-                if idx + 3 <= current_length and line[idx : idx + 3] == "two":
-                    current_digits.append(2)
-                elif idx + 5 <= current_length and line[idx : idx + 5] == "three":
-                    current_digits.append(3)
-            elif c == "f":
-                if idx + 4 <= current_length and line[idx : idx + 4] == "four":
-                    current_digits.append(4)
-                elif idx + 4 <= current_length and line[idx : idx + 4] == "five":
-                    current_digits.append(5)
-            elif c == "s":
-                if idx + 3 <= current_length and line[idx : idx + 3] == "six":
-                    current_digits.append(6)
-                elif idx + 5 <= current_length and line[idx : idx + 5] == "seven":
-                    current_digits.append(7)
-            elif c == "e":
-                if idx + 5 <= current_length and line[idx : idx + 5] == "eight":
-                    current_digits.append(8)
-            elif c == "n":
-                if idx + 4 <= current_length and line[idx : idx + 4] == "nine":
-                    current_digits.append(9)
-
-        digits.append(int(f"{current_digits[0]}{current_digits[-1]}"))
-
-    return sum(digits)
+    with open(join(DATA_DIR, filename), "rb") as fh:
+        return calibrate(fh)
+
+
+def part2(filename: str) -> int:
+    with open(join(DATA_DIR, filename), "rb") as fh:
+        return calibrate(fh, spelled=True)
+
 
+assert calibration_value(b"eightwo3xtwone", spelled=True) == 81
+assert calibration_value(b"eightwo3xtwone") == 33
+assert calibration_value(b"\n") is None
 
 if __name__ == "__main__":
     assert part1("day01_part1_sample.txt") == 142
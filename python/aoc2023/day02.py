@@ -1,78 +1,80 @@
-from dataclasses import dataclass
+import re
+from array import array
+from dataclasses import dataclass, field
 from os.path import join
+from typing import Iterable
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
+COLORS = ("red", "green", "blue")
 
-@dataclass
-class Round:
-    red: int
-    green: int
-    blue: int
-
-    @classmethod
-    def read(cls, input: str) -> "Round":
-        kwargs = {"red": 0, "green": 0, "blue": 0}
-        for pull in input.strip().split(","):
-            num, color = pull.strip().split(" ")
-            kwargs[color.strip()] = int(num)
-
-        return Round(**kwargs)
+# a game's id or one pull, told apart by which groups matched. a colour is
+# known from its first letter
+TOKEN = re.compile(rb"Game (\d+)|(\d+) ([rgb])")
+COLUMN = {ord(color[0]): idx for idx, color in enumerate(COLORS)}
 
 
 @dataclass
-class Game:
-    idx: int
-    rounds: list[Round]
+class MaxTable:
+    """one row per game, holding its id and the most balls of each colour
+    seen in any of its rounds
+    """
+
+    ids: array = field(default_factory=lambda: array("I"))
+    red: array = field(default_factory=lambda: array("I"))
+    green: array = field(default_factory=lambda: array("I"))
+    blue: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def possible(self, max_red: int, max_green: int, max_blue: int) -> int:
+        """sum of the ids of the games the bag could have played"""
+        return sum(
+            idx
+            for idx, red, green, blue in zip(self.ids, self.red, self.green, self.blue)
+            if red <= max_red and green <= max_green and blue <= max_blue
+        )
 
-    @classmethod
-    def read(cls, input: str, max_red: int, max_green: int, max_blue: int) -> "Game":
-        left, right = input.strip().split(":")
-        _, idx = left.strip().split(" ")
+    def possible_many(self, limits: Iterable[tuple[int, int, int]]) -> list[int]:
+        return [self.possible(*limit) for limit in limits]
 
-        rounds = [Round.read(input) for input in right.split(";")]
+    def powers(self) -> int:
+        return sum(r * g * b for r, g, b in zip(self.red, self.green, self.blue))
 
-        return Game(
-            idx=int(idx),
-            rounds=rounds,
-        )
 
-    def is_valid(self, max_balls: dict[str, int]) -> bool:
-        for round in self.rounds:
-            for color, max_value in max_balls.items():
-                if getattr(round, color) > max_value:
-                    return False
-        return True
+def parse(data: bytes) -> MaxTable:
+    table = MaxTable()
+    maxima = [table.red, table.green, table.blue]
+
+    for idx, count, color in TOKEN.findall(data):
+        if idx:
+            table.ids.append(int(idx))
+            for column in maxima:
+                column.append(0)
+        else:
+            column = maxima[COLUMN[color[0]]]
+            column[-1] = max(column[-1], int(count))
 
-    def score_min_balls(self) -> int:
-        red, green, blue = 0, 0, 0
-        for round in self.rounds:
-            red = max(red, round.red)
-            green = max(green, round.green)
-            blue = max(blue, round.blue)
-        return red * green * blue
+    return table
 
 
-def read(filename: str) -> list[Game]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        games = [
-            Game.read(line, max_red=12, max_green=13, max_blue=14)
-            for line in fh.readlines()
-            if line.strip() != ""
-        ]
-    return games
+@cached_input(version=2)
+def read(filename: str) -> MaxTable:
+    with open(join(DATA_DIR, filename), "rb") as fh:
+        return parse(fh.read())
 
 
 def part1(filename: str) -> int:
-    games = read(filename)
-    max_balls = {"red": 12, "green": 13, "blue": 14}
-    return sum(game.idx for game in games if game.is_valid(max_balls))
+    return read(filename).possible(max_red=12, max_green=13, max_blue=14)
 
 
 def part2(filename: str) -> int:
-    games = read(filename)
-    return sum(game.score_min_balls() for game in games)
+    return read(filename).powers()
+
 
+assert parse(b"Game 7: 3 blue, 4 red; 1 red, 2 green, 6 blue").blue == array("I", [6])
 
 if __name__ == "__main__":
     assert part1("day02_sample.txt") == 8
@@ -1,141 +1,152 @@
-from dataclasses import dataclass, field
+import re
+from array import array
+from collections import deque
 from os.path import join
-from string import digits
+from typing import Iterable, Iterator, Sequence
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
-DIGITS = frozenset(digits)
-DIGITS_DOT = frozenset(digits + ".")
+NUMBER = re.compile(r"\d+")
+SYMBOL = re.compile(r"[^\d.]")
+GEAR = re.compile(r"\*")
 
+NO_NUMBER = -1
 
-def read_input(filename) -> list[str]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        lines = fh.read().strip().split("\n")
-
-    # padding so we don't need to worry about edges
-    lines = ["." + line + "." for line in lines]
-    empty_line = ["." * len(lines[0])]
-    return empty_line + lines + empty_line
-
-
-@dataclass
-class Number:
-    row: int
-    col: int
-    length: int
-    value: int
-    has_symbol: bool = False
 
+def label_row(line: str, first_id: int) -> tuple[array, list[int]]:
+    """the id of the number covering each cell, or NO_NUMBER, along with the
+    row's numbers. ids count up from first_id
+    """
+    labels = array("i", [NO_NUMBER]) * len(line)
+    values: list[int] = []
+    for match in NUMBER.finditer(line):
+        start, end = match.span()
+        labels[start:end] = array("i", [first_id + len(values)]) * (end - start)
+        values.append(int(match.group()))
+    return labels, values
 
-def locate_numbers(lines: list[str]) -> list[Number]:
-    numbers: list[Number] = []
 
-    num_rows, num_cols = len(lines), len(lines[0])
+def adjacent(labels: Sequence[array], col: int) -> set[int]:
+    """ids of the numbers around col in the middle of three rows of labels"""
+    ids: set[int] = set()
+    for row in labels:
+        ids.update(row[col - 1 : col + 2])
+    ids.discard(NO_NUMBER)
+    return ids
 
-    row = 1
-    while row < num_rows - 1:
-        line = lines[row]
 
-        col = 1
-        while col < num_cols - 1:
-            char = line[col]
-            if char in DIGITS:
-                length = 0
-                while col + length < num_cols and char in DIGITS:
-                    length += 1
-                    char = line[col + length]
-                numbers.append(Number(row, col, length, int(line[col : col + length])))
-                col += length
-            else:
-                col += 1
-
-        row += 1
-
-    return numbers
-
-
-def update_symbol(number: Number, lines: list[str]) -> Number:
-    char_sets = [
-        set(row[number.col - 1 : number.col + number.length + 1])
-        for row in lines[number.row - 1 : number.row + 2]
-    ]
+@cached_input(version=2)
+def read_input(filename) -> tuple[list[str], list[array], list[int]]:
+    with open(join(DATA_DIR, filename), "r") as fh:
+        lines = fh.read().strip().split("\n")
 
-    chars = list(set().union(*char_sets) - DIGITS_DOT)
+    # padding so we don't need to worry about edges
+    lines = ["." + line + "." for line in lines]
+    empty_line = "." * len(lines[0])
+    lines = [empty_line] + lines + [empty_line]
 
-    if len(chars) > 0:
-        number.has_symbol = True
+    labels: list[array] = []
+    values: list[int] = []
+    for line in lines:
+        row_labels, row_values = label_row(line, len(values))
+        labels.append(row_labels)
+        values += row_values
 
-    return number
+    return lines, labels, values
 
 
 def part1(filename: str) -> int:
-    lines = read_input(filename)
-
-    numbers = locate_numbers(lines)
-    numbers = [update_symbol(number, lines) for number in numbers]
-
-    return sum([number.value for number in numbers if number.has_symbol])
-
+    lines, labels, values = read_input(filename)
 
-@dataclass
-class Gear:
-    row: int
-    col: int
-    touching: list["Number"] = field(default_factory=list)
-
-    def touches(self, number: Number) -> bool:
-        if abs(number.row - self.row) > 1:
-            return False
-        elif (
-            min(
-                abs(number.col - self.col),
-                abs(number.col + number.length - self.col - 1),
-            )
-            > 1
-        ):
-            return False
-        else:
-            return True
+    part_numbers: set[int] = set()
+    for row, line in enumerate(lines):
+        for symbol in SYMBOL.finditer(line):
+            part_numbers |= adjacent(labels[row - 1 : row + 2], symbol.start())
 
-    def update(self, numbers: list[Number]) -> "Gear":
-        for number in numbers:
-            if self.touches(number):
-                self.touching += [number]
-        return self
+    return sum(values[idx] for idx in part_numbers)
 
 
-def locate_gears(lines: list[str]) -> list[Gear]:
-    gears: list[Gear] = []
+def part2(filename: str) -> int:
+    lines, labels, values = read_input(filename)
 
+    gear_ratio_sum = 0
     for row, line in enumerate(lines):
-        for col, char in enumerate(line):
-            if char == "*":
-                gears.append(Gear(row, col))
+        for gear in GEAR.finditer(line):
+            touching = adjacent(labels[row - 1 : row + 2], gear.start())
+            if len(touching) < 2:
+                continue
 
-    return gears
+            assert len(touching) == 2
 
+            first, second = touching
+            gear_ratio_sum += values[first] * values[second]
 
-def part2(filename: str) -> int:
-    lines = read_input(filename)
+    return gear_ratio_sum
 
-    numbers = locate_numbers(lines)
-    gears = locate_gears(lines)
-    gears = [gear.update(numbers) for gear in gears]
 
-    gear_ratio_sum = 0
-    for gear in gears:
-        if len(gear.touching) < 2:
+def stream(lines: Iterable[str]) -> Iterator[tuple[str, int]]:
+    """yields ("part", number) for every part number and ("gear", ratio) for
+    every gear, each as soon as the row below its symbol has been read. only
+    three rows and their numbers are held at once, so lines can come from a
+    schematic of any height
+    """
+    window: deque[tuple[str, array, range]] = deque(maxlen=3)
+    values: dict[int, int] = {}
+    emitted: set[int] = set()
+    next_id = 0
+
+    def push(line: str) -> None:
+        nonlocal next_id
+        if len(window) == 3:
+            # the oldest row's numbers can't touch anything still to come
+            for idx in window[0][2]:
+                del values[idx]
+                emitted.discard(idx)
+
+        labels, row_values = label_row(line, next_id)
+        ids = range(next_id, next_id + len(row_values))
+        values.update(zip(ids, row_values))
+        window.append((line, labels, ids))
+        next_id += len(row_values)
+
+    def process_middle() -> Iterator[tuple[str, int]]:
+        line = window[1][0]
+        labels = [labels for _, labels, _ in window]
+        for symbol in SYMBOL.finditer(line):
+            touching = adjacent(labels, symbol.start())
+            for idx in touching - emitted:
+                emitted.add(idx)
+                yield "part", values[idx]
+            if symbol.group() == "*" and len(touching) == 2:
+                first, second = touching
+                yield "gear", values[first] * values[second]
+
+    width = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
             continue
 
-        assert len(gear.touching) == 2
+        line = "." + line + "."
+        if width is None:
+            width = len(line)
+            push("." * width)
+        push(line)
+        if len(window) == 3:
+            yield from process_middle()
 
-        gear_ratio = 1
-        for number in gear.touching:
-            gear_ratio *= number.value
+    if width is not None:
+        push("." * width)
+        yield from process_middle()
 
-        gear_ratio_sum += gear_ratio
 
-    return gear_ratio_sum
+def stream_totals(lines: Iterable[str]) -> tuple[int, int]:
+    """the part 1 and part 2 answers for a schematic read line by line"""
+    totals = {"part": 0, "gear": 0}
+    for kind, value in stream(lines):
+        totals[kind] += value
+    return totals["part"], totals["gear"]
 
 
 if __name__ == "__main__":
@@ -144,3 +155,6 @@ if __name__ == "__main__":
 
     assert part2("day03_sample.txt") == 467835
     assert part2("day03.txt") == 81939900
+
+    with open(join(DATA_DIR, "day03.txt"), "r") as fh:
+        assert stream_totals(fh) == (537832, 81939900)
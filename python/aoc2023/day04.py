@@ -1,50 +1,67 @@
+from array import array
+from collections import deque
 from os.path import join
+from typing import BinaryIO, Iterable
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
 
-class Card:
-    def __init__(
-        self, card_num: int, winning_numbers: set[int], numbers: set[int]
-    ) -> None:
-        self.card_num = card_num
-        self.winning_numbers = winning_numbers
-        self.numbers = numbers
-        self.num_matching = len(self.winning_numbers.intersection(self.numbers))
-        self.points = 0 if self.num_matching == 0 else 1 << (self.num_matching - 1)
+def to_mask(numbers: bytes) -> int:
+    # the numbers are all below 100, so a set of them fits in one int
+    mask = 0
+    for number in numbers.split():
+        mask |= 1 << int(number)
+    return mask
 
 
-def read_input(filename: str) -> list[Card]:
-    cards: list[Card] = []
+def count_matching(line: bytes) -> int:
+    _, _, numbers = line.partition(b":")
+    winning, _, have = numbers.partition(b"|")
+    return (to_mask(winning) & to_mask(have)).bit_count()
 
-    with open(join(DATA_DIR, filename), "r") as fh:
-        for line in fh.read().strip().split("\n"):
-            card, rest = line.split(":")
-            left, right = rest.split("|")
 
-            card_num = int(card.split()[1])
-            winning_numbers = {int(num) for num in left.split() if num.strip() != ""}
-            numbers = {int(num) for num in right.split() if num.strip() != ""}
-            cards.append(Card(card_num, winning_numbers, numbers))
+def fold(matching: Iterable[int]) -> tuple[int, int]:
+    """the points and the total number of cards, given each card's number of
+    matches in order. copies are tracked with a difference array over just
+    the cards still to be won, so every card is O(1) and nothing is kept
+    """
+    points = total = 0
+    copies_won = 0
+    diff: deque[int] = deque()
 
-    return cards
+    for num_matching in matching:
+        if diff:
+            copies_won += diff.popleft()
+        num_cards = 1 + copies_won
+        total += num_cards
+        points += (1 << num_matching) >> 1
 
+        if num_matching:
+            # every copy of this card wins a copy of each of the next ones
+            diff.extend([0] * (num_matching + 1 - len(diff)))
+            diff[0] += num_cards
+            diff[num_matching] -= num_cards
 
-def part1(filename: str) -> int:
-    cards = read_input(filename)
-    return sum([card.points for card in cards])
+    return points, total
 
 
-def part2(filename: str) -> int:
-    cards = read_input(filename)
+def fold_file(fh: BinaryIO) -> tuple[int, int]:
+    return fold(count_matching(line) for line in fh if line.strip())
+
 
-    num_cards = [1] * len(cards)
-    for idx, card in enumerate(cards):
-        for offset in range(card.num_matching):
-            if idx + offset < len(cards):
-                num_cards[idx + offset + 1] += num_cards[idx]
+@cached_input(version=2)
+def read_input(filename: str) -> array:
+    with open(join(DATA_DIR, filename), "rb") as fh:
+        return array("B", (count_matching(line) for line in fh if line.strip()))
 
-    return sum(num_cards)
+
+def part1(filename: str) -> int:
+    return fold(read_input(filename))[0]
+
+
+def part2(filename: str) -> int:
+    return fold(read_input(filename))[1]
 
 
 if __name__ == "__main__":
@@ -53,3 +70,6 @@ if __name__ == "__main__":
 
     assert part2("day04_sample.txt") == 30
     assert part2("day04.txt") == 15455663
+
+    with open(join(DATA_DIR, "day04.txt"), "rb") as fh:
+        assert fold_file(fh) == (23678, 15455663)
@@ -1,11 +1,14 @@
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from itertools import batched
-from os.path import join
+from typing import Iterable, Iterator, Sequence
 
-from aoc2023 import DATA_DIR, Range
+from aoc2023 import Input, Range, RangeSet, Segment, get_backend
+from aoc2023.cache import cached_input
 
-Shifted = Range | None
-Unshifted = Range | None
+# stands in for the end of the last piece, which runs on forever
+UNBOUNDED = 1 << 62
 
 
 @dataclass
@@ -17,115 +20,190 @@ class RangeMap:
         assert len(self.source) == len(self.dest)
         self.diff = self.dest.start - self.source.start
 
-    def shift(self, range_: Range) -> tuple[Shifted, Unshifted]:
-        intersection = self.source.intersection(range_)
+    @property
+    def segment(self) -> Segment:
+        return self.source.start, self.source.end, self.diff
 
-        # no intersection
-        if intersection is None:
-            return None, range_
-        # complete intersection
-        elif intersection == range_:
-            return range_.shift_by(self.diff), None
-        # partial intersection
-        else:
-            shifted = intersection.shift_by(self.diff)
-            unshifted = range_ - intersection
 
-            assert unshifted is not None
-            assert len(unshifted) <= 2
-            assert len(unshifted) >= 1
+Layer = list[RangeMap]
 
-            return shifted, unshifted[0]
 
+@dataclass
+class PiecewiseMap:
+    """a mapping of every value from 0 up, as sorted pieces that each add
+    an offset. piece idx covers starts[idx] up to the next start
+    """
+
+    starts: array = field(default_factory=lambda: array("q"))
+    offsets: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_layer(cls, layer: Layer) -> "PiecewiseMap":
+        mapping = cls()
+        position = 0
+        for start, end, offset in sorted(range_map.segment for range_map in layer):
+            if position < start:
+                # values between the maps are passed through as they are
+                mapping.add(position, 0)
+            mapping.add(start, offset)
+            position = end
+        mapping.add(position, 0)
+        return mapping
+
+    @classmethod
+    def compose(cls, layers: Iterable[Layer]) -> "PiecewiseMap":
+        mapping = cls()
+        mapping.add(0, 0)
+        for layer in layers:
+            mapping = mapping.then(cls.from_layer(layer))
+        return mapping
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
+
+    def map_many(self, values: Iterable[int]) -> array:
+        """maps a whole batch, in the order given, without building anything
+        per value. numpy does it in one searchsorted
+        """
+        values = values if isinstance(values, array) else array("q", values)
+        if get_backend() == "numpy":
+            from aoc2023.numpy_backend import piecewise_lookup
+
+            return piecewise_lookup(self.starts, self.offsets, values)
+
+        starts, offsets = self.starts, self.offsets
+        return array("q", (v + offsets[bisect_right(starts, v) - 1] for v in values))
+
+    def add(self, start: int, offset: int) -> None:
+        # neighbours with the same offset are one piece
+        if self.offsets and self.offsets[-1] == offset:
+            return
+        self.starts.append(start)
+        self.offsets.append(offset)
+
+    def end(self, idx: int) -> int:
+        return self.starts[idx + 1] if idx + 1 < len(self.starts) else UNBOUNDED
+
+    def pieces(self) -> Iterator[Segment]:
+        for idx, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            yield start, self.end(idx), offset
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """this mapping followed by other, as a single mapping"""
+        composed = PiecewiseMap()
+        for start, end, offset in self.pieces():
+            # cut the piece wherever its image crosses one of other's starts
+            idx = bisect_right(other.starts, start + offset) - 1
+            while start < end:
+                stop = min(end, other.end(idx) - offset)
+                composed.add(start, offset + other.offsets[idx])
+                start = stop
+                idx += 1
+        return composed
+
+    def segments(self) -> list[Segment]:
+        """the pieces that move values, as RangeSet.shift wants them"""
+        return [piece for piece in self.pieces() if piece[2]]
+
+    def apply(self, values: RangeSet) -> RangeSet:
+        return values.shift(self.segments())
+
+    def preimage(self, values: RangeSet) -> RangeSet:
+        """everything that maps into values"""
+        return RangeSet(
+            (low - offset, high - offset)
+            for start, end, offset in self.pieces()
+            for low, high in values.clip(start + offset, end + offset)
+        )
+
+    def by_image(self) -> list[Segment]:
+        """the pieces ordered by where they send values, lowest first"""
+        return sorted(self.pieces(), key=lambda piece: piece[0] + piece[2])
+
+    def lowest(
+        self, values: RangeSet, by_image: Sequence[Segment] | None = None
+    ) -> int:
+        """the smallest value anything in values maps to. pieces are tried
+        from the lowest image up, so the search stops at the first one that
+        values reach rather than mapping all of them. by_image can be passed
+        in to reuse the ordering across calls
+        """
+        if by_image is None:
+            by_image = self.by_image()
+
+        best: int | None = None
+        for start, end, offset in by_image:
+            if best is not None and start + offset >= best:
+                break
+            for low, _ in values.clip(start, end):
+                best = low + offset if best is None else min(best, low + offset)
+                break
 
-Layer = list[RangeMap]
+        if best is None:
+            raise ValueError("lowest of an empty RangeSet")
+        return best
 
 
 @dataclass
 class Almanac:
-    seeds: list[Range]
+    seeds: array
     layers: list[Layer]
 
     def __post_init__(self) -> None:
-        self.locations: list[Range] = self.apply()
-
-    @staticmethod
-    def apply_layer_to_seed_range(layer: Layer, seeds: Range) -> list[Range]:
-        unshifted: None | Range = seeds
-
-        shifted: list[Range] = []
-        for range_map in layer:
-            assert unshifted is not None  # for type-checker
-            shifted_, unshifted = range_map.shift(unshifted)
-            if shifted_ is not None:
-                shifted.append(shifted_)
-            if unshifted is None:
-                break
-        else:
-            if unshifted is not None:
-                shifted.append(unshifted)
-
-        return shifted
+        # every layer folded into one table, seed lists can reuse it
+        self.mapping = PiecewiseMap.compose(self.layers)
+        self.by_location = self.mapping.by_image()
 
-    def apply_layer(self, layer: Layer, seed_ranges: list[Range]) -> list[Range]:
-        # apply the layer to each seed range...
-        shifted = [
-            self.apply_layer_to_seed_range(layer, seed_range)
-            for seed_range in seed_ranges
-        ]
-
-        # ...and flatten
-        return [range_ for ranges in shifted for range_ in ranges]
-
-    def apply(self) -> list[Range]:
-        locations = self.seeds
-        for layer in self.layers:
-            locations = self.apply_layer(layer, locations)
-
-        return locations
+    def seed_ranges(self) -> RangeSet:
+        return RangeSet(
+            (seed_start, seed_start + num_seeds)
+            for seed_start, num_seeds in batched(self.seeds, 2)
+        )
 
+    def locations(self, seeds: RangeSet) -> RangeSet:
+        return self.mapping.apply(seeds)
 
-def read_input(filename, part: int) -> Almanac:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        lines = [line.strip() for line in fh.read().split("\n") if "map" not in line]
+    def seeds_for(self, locations: RangeSet) -> RangeSet:
+        return self.mapping.preimage(locations)
 
-    seeds: list[Range]
+    def lowest_location(self, seeds: RangeSet) -> int:
+        return self.mapping.lowest(seeds, self.by_location)
 
-    if part == 1:
-        seeds = [Range(int(_), int(_)) for _ in lines[0].split(":")[1].split()]
-    elif part == 2:
-        seed_data = [int(_) for _ in lines[0].split(":")[1].split()]
 
-        seeds = []
-        for seed_start, num_seeds in batched(seed_data, 2):
-            seeds.append(Range(seed_start, seed_start + num_seeds))
-    else:
-        raise ValueError("invalid part, must be 1 or 2")
+@cached_input(version=4)
+def read_input(filename) -> Almanac:
+    with Input(filename) as data:
+        seed_section, *layer_sections = [
+            bytes(section) for section in data.paragraphs()
+        ]
+    seeds = array("q", (int(_) for _ in seed_section.split(b":")[1].split()))
 
     layers: list[Layer] = []
-    layer: list[RangeMap] = []
 
-    for line in lines[2:]:
-        if line != "":
+    for section in layer_sections:
+        # the first line is the "x-to-y map:" header
+        layer: list[RangeMap] = []
+        for line in section.split(b"\n")[1:]:
             dest_start, source_start, length = [int(_) for _ in line.split()]
             source_range = Range(source_start, source_start + length)
             dest_range = Range(dest_start, dest_start + length)
             layer.append(RangeMap(source_range, dest_range))
-        else:
-            layers.append(layer)
-            layer = []
+        layers.append(layer)
 
     return Almanac(seeds, layers)
 
 
 def part1(filename: str) -> int:
-    almanac = read_input(filename, 1)
-    return min(range.start for range in almanac.locations)
+    almanac = read_input(filename)
+    return min(almanac.mapping.map_many(almanac.seeds))
 
 
 def part2(filename: str) -> int:
-    almanac = read_input(filename, 2)
-    return min(range.start for range in almanac.locations)
+    almanac = read_input(filename)
+    return almanac.lowest_location(almanac.seed_ranges())
 
 
 assert Range(1, 3) == Range(1, 3)
@@ -139,6 +217,16 @@ assert Range(1, 2) - Range(0, 3) is None
 assert Range(1, 4) - Range(6, 9) == [Range(1, 4)]
 assert Range(1, 4) - Range(2, 3) == [Range(1, 2), Range(3, 4)]
 
+assert RangeSet([(5, 7), (1, 3), (3, 4)]) == RangeSet([(1, 4), (5, 7)])
+assert RangeSet([(1, 9)]) - RangeSet([(3, 4)]) == RangeSet([(1, 3), (4, 9)])
+assert RangeSet([(1, 9)]).shift([(3, 5, 10)]) == RangeSet([(1, 3), (5, 9), (13, 15)])
+
+_bump = PiecewiseMap(array("q", [0, 5]), array("q", [3, 0]))
+assert _bump.map_many([5, 0, 7]) == array("q", [5, 3, 7])
+assert _bump.preimage(RangeSet([(5, 6)])) == RangeSet([(2, 3), (5, 6)])
+assert _bump.lowest(RangeSet([(4, 6)])) == 5
+assert list(_bump.then(_bump).pieces()) == [(0, 2, 6), (2, 5, 3), (5, UNBOUNDED, 0)]
+
 if __name__ == "__main__":
     assert part1("day05_sample.txt") == 35
     assert part1("day05.txt") == 424490994
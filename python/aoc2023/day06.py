@@ -1,8 +1,12 @@
+from math import isqrt, prod
 from os.path import join
+from typing import Iterable
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
 
+@cached_input()
 def read_input(filename: str) -> tuple[tuple[int, ...], ...]:
     with open(join(DATA_DIR, filename), "r") as fh:
         lines = [line.strip() for line in fh.read().split("\n") if line.strip() != ""]
@@ -13,54 +17,50 @@ def read_input(filename: str) -> tuple[tuple[int, ...], ...]:
     return time, distances
 
 
-def get_distance(total_time: int, hold_time: int | float) -> int | float:
+def get_distance(total_time: int, hold_time: int) -> int:
     return hold_time * (total_time - hold_time)
 
 
-def bisect(total_time: int, distance: int, diff: float = 0.5) -> int:
-    # find the least hold_time such that the distance travelled > distance
-    low = 0.0
-    high = total_time / 2
+def ways_to_win(total_time: int, distance: int) -> int:
+    """the number of hold times that beat distance. they're the integers
+    strictly between the roots of h * (total_time - h) = distance, which are
+    symmetric about total_time / 2, so only the lower one is needed. isqrt
+    keeps it exact however big the numbers get
+    """
+    discriminant = total_time * total_time - 4 * distance
+    if discriminant <= 0:
+        return 0
 
-    assert distance < get_distance(total_time, high)
+    # isqrt rounds down, so this is within a step of the first winner. there
+    # may be no winner at all when the roots are less than one apart
+    first_winner = (total_time - isqrt(discriminant)) // 2
+    half = total_time // 2
+    while first_winner <= half and get_distance(total_time, first_winner) <= distance:
+        first_winner += 1
+    while first_winner > 0 and get_distance(total_time, first_winner - 1) > distance:
+        first_winner -= 1
 
-    while low < high:
-        midpoint = (low + high) / 2
-        dist = get_distance(total_time, midpoint)
-        if abs(dist - distance) < diff:
-            for idx in range(int(midpoint), total_time // 2):
-                if get_distance(total_time, idx) > distance:
-                    return idx
-        elif dist < distance:
-            low = midpoint
-        else:  # dist > distance:
-            high = midpoint
+    return max(total_time - 2 * first_winner + 1, 0)
 
-    raise NotImplementedError(1)
 
+def ways_to_win_many(races: Iterable[tuple[int, int]]) -> list[int]:
+    return [ways_to_win(total_time, distance) for total_time, distance in races]
 
-def part1(filename: str) -> int:
-    times, distances = read_input(filename)
 
-    prod = 1
-    for total_time, distance in zip(times, distances):
-        first_winner = bisect(total_time, distance)
-        if total_time % 2 == 0:
-            num_winners = (2 * ((total_time // 2) - first_winner)) + 1
-        else:
-            num_winners = 2 * (((total_time // 2) - first_winner) + 1)
+def part1(filename: str) -> int:
+    return prod(ways_to_win_many(zip(*read_input(filename))))
 
-        prod *= num_winners
 
-    return prod
+def part2(total_time: int, distance: int) -> int:
+    return ways_to_win(total_time, distance)
 
 
-def part2(total_time: int, distance: int) -> int:
-    first_winner = bisect(total_time, distance)
-    if total_time % 2 == 0:
-        return (2 * ((total_time // 2) - first_winner)) + 1
-    else:
-        return 2 * (((total_time // 2) - first_winner) + 1)
+assert ways_to_win(30, 200) == 9
+assert ways_to_win(4, 4) == 0
+assert ways_to_win(1, 0) == 0
+# the best hold only just wins, and then only ties
+assert ways_to_win(2 * 10**20, 10**40 - 1) == 1
+assert ways_to_win(2 * 10**20, 10**40) == 0
 
 
 if __name__ == "__main__":
@@ -1,188 +1,242 @@
-from collections import Counter
-from dataclasses import dataclass
-from enum import StrEnum
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from enum import IntEnum
 from os.path import join
+from typing import Iterable, Iterator
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
+HAND_SIZE = 5
+JOKER = "J"
 
-class HandType(StrEnum):
-    Undefined = "_"
-    HighCard = "A"
-    OnePair = "B"
-    TwoPair = "C"
-    Three = "D"
-    FullHouse = "E"
-    Four = "F"
-    Five = "G"
 
+class HandType(IntEnum):
+    HighCard = 0
+    OnePair = 1
+    TwoPair = 2
+    Three = 3
+    FullHouse = 4
+    Four = 5
+    Five = 6
 
-@dataclass
-class Hand:
-    cards: str
-    wager: int
-    hand_type: HandType = HandType.Undefined
-    score: str = ""
-
-    def __post_init__(self):
-        self.hand_type = self.get_hand_type()
-        self.score = (
-            str(self.hand_type)
-            + "-"
-            + self.cards.replace("T", "V")
-            .replace("J", "W")
-            .replace("Q", "X")
-            .replace("K", "Y")
-            .replace("A", "Z")
-        )
-
-    def get_hand_type(self) -> HandType:
-        counts = sorted(Counter(self.cards).values(), reverse=True)
-        match counts:
-            case x if x[0] == 5:
-                return HandType.Five
-            case x if x[0] == 4:
-                return HandType.Four
-            case x if x[0] == 3:
-                if x[1] == 2:
-                    return HandType.FullHouse
-                else:
-                    return HandType.Three
-            case x if x[0] == 2:
-                if x[1] == 2:
-                    return HandType.TwoPair
-                else:
-                    return HandType.OnePair
-            case _:
-                return HandType.HighCard
-
-    def __lt__(self, other: "Hand") -> bool:
-        if not self.hand_type == other.hand_type:
-            return self.hand_type < other.hand_type
-        else:
-            return self.score < other.score
-
-
-def read_input(filename: str) -> list[Hand]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        values = [line.split() for line in fh.read().strip().split("\n")]
-    return [Hand(cards, int(wager)) for cards, wager in values]
 
+BY_COUNTS: dict[tuple[int, ...], HandType] = {
+    (1, 1, 1, 1, 1): HandType.HighCard,
+    (2, 1, 1, 1): HandType.OnePair,
+    (2, 2, 1): HandType.TwoPair,
+    (3, 1, 1): HandType.Three,
+    (3, 2): HandType.FullHouse,
+    (4, 1): HandType.Four,
+    (5,): HandType.Five,
+}
 
-def part1(filename: str) -> int:
-    cards = read_input(filename)
 
-    sum_ = 0
-    for idx, hand in enumerate(sorted(cards), start=1):
-        sum_ += hand.wager * idx
+def partitions(total: int, largest: int | None = None) -> Iterator[tuple[int, ...]]:
+    """the ways of splitting total cards into groups, biggest group first"""
+    if total == 0:
+        yield ()
+        return
+    for first in range(min(total, largest or total), 0, -1):
+        for rest in partitions(total - first, first):
+            yield (first, *rest)
 
-    return sum_
 
+def signature(cards: str) -> int:
+    # the sum of the squares of the group sizes, which is different for
+    # every way of grouping the same number of cards
+    return sum(map(cards.count, cards))
 
-@dataclass
-class WildHand:
-    cards: str
-    wager: int
-    hand_type: HandType = HandType.Undefined
-    score: str = ""
-
-    def __post_init__(self):
-        self.hand_type = self.get_hand_type()
-        self.score = str(self.hand_type) + self.cards.replace("T", "V").replace(
-            "J", "1"
-        ).replace("Q", "X").replace("K", "Y").replace("A", "Z")
-
-    def get_hand_type(self) -> HandType:
-        counter = Counter(self.cards)
-
-        if "J" in counter:
-            num_j = counter["J"]
-            del counter["J"]
-        else:
-            num_j = 0
-
-        assert num_j + sum(counter.values()) == 5
-
-        counts = sorted(counter.values(), reverse=True)
-
-        try:
-            c0 = counts[0]
-        except IndexError:
-            c0 = 0
-
-        try:
-            c1 = counts[1]
-        except IndexError:
-            c1 = 0
-
-        match c0, c1, num_j:
-            case 0, 0, 5:
-                return HandType.Five
-            case 5, 0, 0:
-                return HandType.Five
-            case 4, 0, 1:
-                return HandType.Five
-            case 4, 1, 0:
-                return HandType.Four
-            case 3, 0, 2:
-                return HandType.Five
-            case 3, 1, 1:
-                return HandType.Four
-            case 3, 2, 0:
-                return HandType.FullHouse
-            case 3, 1, 0:
-                return HandType.Three
-            case 2, 0, 3:
-                return HandType.Five
-            case 2, 1, 2:
-                return HandType.Four
-            case 2, 1, 1:
-                return HandType.Three
-            case 2, 2, 1:
-                return HandType.FullHouse
-            case 2, 2, 0:
-                return HandType.TwoPair
-            case 2, 1, 0:
-                return HandType.OnePair
-            case 1, 0, 4:
-                return HandType.Five
-            case 1, 1, 3:
-                return HandType.Four
-            case 1, 1, 2:
-                return HandType.Three
-            case 1, 1, 1:
-                return HandType.OnePair
-            case 1, 1, 0:
-                return HandType.HighCard
-            case _:
-                raise NotImplementedError(1)
-
-    def __lt__(self, other: "WildHand") -> bool:
-        if not self.hand_type == other.hand_type:
-            return self.hand_type < other.hand_type
-        else:
-            return self.score < other.score
-
-
-def read_wild_input(filename: str) -> list[WildHand]:
+
+def build_types() -> list[list[HandType | None]]:
+    """TYPES[jokers][signature of the other cards] is the hand's type. the
+    jokers always do best joining the biggest group
+    """
+    types: list[list[HandType | None]] = []
+    for jokers in range(HAND_SIZE + 1):
+        row: list[HandType | None] = [None] * (HAND_SIZE * HAND_SIZE + 1)
+        for counts in partitions(HAND_SIZE - jokers):
+            best = ((counts[0] if counts else 0) + jokers, *counts[1:])
+            row[sum(count * count for count in counts)] = BY_COUNTS[best]
+        types.append(row)
+    return types
+
+
+TYPES = build_types()
+
+# each card as a base 13 digit, with jokers the lowest when they're wild
+DIGITS = "0123456789abc"
+RANKS = str.maketrans("23456789TJQKA", DIGITS)
+WILD_RANKS = str.maketrans("J23456789TQKA", DIGITS)
+
+# hands sort by type first, so it goes above every card's digit
+TYPE_WEIGHT = len(DIGITS) ** HAND_SIZE
+
+
+def classify(cards: str, wild: bool = False) -> HandType:
+    others = cards.replace(JOKER, "") if wild else cards
+    hand_type = TYPES[len(cards) - len(others)][signature(others)]
+    assert hand_type is not None, cards
+    return hand_type
+
+
+def hand_key(cards: str, wild: bool = False) -> int:
+    """a single int that sorts the same way as the hands"""
+    ranks = WILD_RANKS if wild else RANKS
+    return classify(cards, wild) * TYPE_WEIGHT + int(cards.translate(ranks), 13)
+
+
+@cached_input(version=2)
+def read_input(filename: str, wild: bool = False) -> tuple[array, array]:
+    keys, wagers = array("q"), array("q")
     with open(join(DATA_DIR, filename), "r") as fh:
-        values = [line.split() for line in fh.read().strip().split("\n")]
-    return [WildHand(cards, int(wager)) for cards, wager in values]
+        for line in fh:
+            if line.strip():
+                cards, wager = line.split()
+                keys.append(hand_key(cards, wild))
+                wagers.append(int(wager))
+    return keys, wagers
+
+
+def total_winnings(keys: array, wagers: array) -> int:
+    # equal hands rank by wager, and only ints are compared, so sorting
+    # never calls back into python
+    ranked = sorted(zip(keys, wagers))
+    return sum(rank * wager for rank, (_, wager) in enumerate(ranked, start=1))
+
+
+class Fenwick:
+    """prefix sums over 0..size-1 with O(log size) point updates. only the
+    nodes that have been touched are stored, so a tree over the whole key
+    space costs nothing until hands arrive and then grows with them
+    """
+
+    __slots__ = ("size", "tree")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.tree: dict[int, int] = {}
+
+    def add(self, idx: int, delta: int) -> None:
+        tree = self.tree
+        idx += 1
+        while idx <= self.size:
+            tree[idx] = tree.get(idx, 0) + delta
+            idx += idx & -idx
+
+    def prefix(self, idx: int) -> int:
+        """the sum of everything before idx"""
+        tree = self.tree
+        total = 0
+        while idx > 0:
+            total += tree.get(idx, 0)
+            idx &= idx - 1
+        return total
 
 
-def part2(filename: str) -> int:
-    hands = sorted(read_wild_input(filename))
+@dataclass
+class Leaderboard:
+    """hands ranked as they come and go, with the total winnings kept up to
+    date. a hand moves the total by its own rank times its wager plus one
+    more of every wager ranked above it, and both come from prefix sums over
+    the key space, so each update is O(log n)
+    """
+
+    size: int = len(HandType) * TYPE_WEIGHT
+    total: int = field(default=0, init=False)
+    num_hands: int = field(default=0, init=False)
+    wager_sum: int = field(default=0, init=False)
+    counts: Fenwick = field(init=False)
+    wagers: Fenwick = field(init=False)
+    # the sorted wagers of the hands at each key, as equal hands rank by
+    # wager. ties are rare so these stay tiny
+    tied: dict[int, list[int]] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        self.counts = Fenwick(self.size)
+        self.wagers = Fenwick(self.size)
+
+    def __len__(self) -> int:
+        return self.num_hands
+
+    def moved(self, key: int, wager: int, tied: list[int], position: int) -> int:
+        """how much the hand at position among the others tied at key adds
+        to the total, while the trees aren't counting it
+        """
+        rank = self.counts.prefix(key) + position + 1
+        above = self.wager_sum - self.wagers.prefix(key + 1) + sum(tied[position:])
+        return rank * wager + above
+
+    def insert(self, key: int, wager: int) -> int:
+        tied = self.tied.setdefault(key, [])
+        position = bisect_right(tied, wager)
+        self.total += self.moved(key, wager, tied, position)
+
+        tied.insert(position, wager)
+        self.counts.add(key, 1)
+        self.wagers.add(key, wager)
+        self.num_hands += 1
+        self.wager_sum += wager
+        return self.total
+
+    def remove(self, key: int, wager: int) -> int:
+        tied = self.tied.get(key, [])
+        position = bisect_left(tied, wager)
+        if position == len(tied) or tied[position] != wager:
+            raise KeyError((key, wager))
+
+        del tied[position]
+        if not tied:
+            del self.tied[key]
+        self.counts.add(key, -1)
+        self.wagers.add(key, -wager)
+        self.num_hands -= 1
+        self.wager_sum -= wager
+
+        self.total -= self.moved(key, wager, tied, position)
+        return self.total
+
+
+def running_totals(lines: Iterable[str], wild: bool = False) -> Iterator[int]:
+    """the total winnings after each hand of a stream is added"""
+    leaderboard = Leaderboard()
+    for line in lines:
+        if line.strip():
+            cards, wager = line.split()
+            yield leaderboard.insert(hand_key(cards, wild), int(wager))
 
-    sum_ = 0
-    for idx, hand in enumerate(hands, start=1):
-        sum_ += hand.wager * idx
 
-    return sum_
+def part1(filename: str) -> int:
+    return total_winnings(*read_input(filename))
 
 
+def part2(filename: str) -> int:
+    return total_winnings(*read_input(filename, wild=True))
+
+
+assert classify("KTJJT") == HandType.TwoPair
+assert classify("KTJJT", wild=True) == HandType.Four
+assert classify("JJJJJ", wild=True) == HandType.Five
+assert hand_key("33332") > hand_key("2AAAA") > hand_key("KKQQA")
+assert hand_key("JKKK2", wild=True) < hand_key("QQQQ2", wild=True)
+
 if __name__ == "__main__":
     assert part1("day07_sample.txt") == 6440
     assert part1("day07.txt") == 251029473
 
     assert part2("day07_sample.txt") == 5905
     assert part2("day07.txt") == 251003917
+
+    with open(join(DATA_DIR, "day07.txt"), "r") as fh:
+        *_, total = running_totals(fh, wild=True)
+    assert total == 251003917
+
+    board = Leaderboard()
+    for cards, wager in (("32T3K", 765), ("T55J5", 684), ("KK677", 28), ("T55J5", 1)):
+        board.insert(hand_key(cards), wager)
+    assert board.total == total_winnings(
+        array("q", map(hand_key, ("32T3K", "T55J5", "KK677", "T55J5"))),
+        array("q", (765, 684, 28, 1)),
+    )
+    assert board.remove(hand_key("T55J5"), 684) == 765 * 1 + 28 * 2 + 1 * 3
@@ -1,96 +1,137 @@
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice
 from math import lcm
-from os.path import join
+from typing import Iterator
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input
+from aoc2023.cache import cached_input
 
+UNKNOWN = -1
 
-def read_input(filename: str) -> tuple[list[str], dict[str, str]]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        content = fh.read().strip()
 
-    turns, nodes = content.split("\n\n")
-    nodes_tmp: dict[str, str] = {}
+@dataclass
+class Network:
+    """nodes are numbered in the order they're listed, left[node] and
+    right[node] are where each turn goes. turns holds 0 for L and 1 for R
+    """
 
+    names: list[str]
+    left: array
+    right: array
+    turns: bytes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, suffix: str) -> list[int]:
+        return [node for node, name in enumerate(self.names) if name.endswith(suffix)]
+
+    def ends(self, nodes: list[int]) -> bytes:
+        is_end = bytearray(len(self))
+        for node in nodes:
+            is_end[node] = 1
+        return bytes(is_end)
+
+
+@cached_input(version=2)
+def read_input(filename: str) -> Network:
+    with Input(filename) as data:
+        turns, nodes = (str(section, "ascii") for section in data.paragraphs())
+
+    names: list[str] = []
+    exits: list[tuple[str, str]] = []
     for node in nodes.split("\n"):
         name, left_right = node.split("=")
         left, right = left_right.strip()[1:-1].split(",")
+        names.append(name.strip())
+        exits.append((left.strip(), right.strip()))
 
-        assert name + "_L" not in nodes_tmp
-        assert name + "_R" not in nodes_tmp
-
-        name = name.strip()
-        nodes_tmp[name + "_L"] = left.strip()
-        nodes_tmp[name + "_R"] = right.strip()
+    ids = {name: node for node, name in enumerate(names)}
+    assert len(ids) == len(names)
 
-    return list(turns), nodes_tmp
+    return Network(
+        names,
+        array("I", (ids[left] for left, _ in exits)),
+        array("I", (ids[right] for _, right in exits)),
+        bytes(turn == "R" for turn in turns),
+    )
 
 
-def part1(filename: str) -> int:
-    # super simple, just walk following the directions
-    # until we hit the end
-    turns, nodes = read_input(filename)
+@dataclass
+class Walker:
+    """walks the network a whole pass of the turns at a time. after[node] is
+    where a pass from node finishes and first_end[node] is how many steps
+    into it an end is first reached, 0 if never. both are filled in the
+    first time a walk starts a pass from that node, so nothing is worked
+    out that the walks don't need
+    """
+
+    network: Network
+    is_end: bytes
+    after: array = field(init=False)
+    first_end: array = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.after = array("i", [UNKNOWN]) * len(self.network)
+        self.first_end = array("i", [UNKNOWN]) * len(self.network)
+
+    def one_pass(self, node: int) -> None:
+        exits = (self.network.left, self.network.right)
+        start, first_end = node, 0
+        for step, turn in enumerate(self.network.turns, start=1):
+            node = exits[turn][node]
+            if not first_end and self.is_end[node]:
+                first_end = step
+        self.after[start] = node
+        self.first_end[start] = first_end
+
+    def walk(self, node: int) -> Iterator[tuple[int, int]]:
+        """(steps, node) every time the walk from node lands on an end"""
+        exits = (self.network.left, self.network.right)
+        turns = self.network.turns
+        steps = 0
+        while True:
+            if self.first_end[node] == UNKNOWN:
+                self.one_pass(node)
 
-    idx, name = 0, "AAA"
-    while True:
-        # the modulo (%) is because if you hit the end of the
-        # directions, you start over
-        turn = turns[idx % len(turns)]
-        name = nodes[name + "_" + turn]
+            if not self.first_end[node]:
+                node = self.after[node]
+            else:
+                # step through this pass, there could be more than one end
+                for step, turn in enumerate(turns, start=1):
+                    node = exits[turn][node]
+                    if self.is_end[node]:
+                        yield steps + step, node
+            steps += len(turns)
 
-        idx += 1
 
-        if name == "ZZZ":
-            return idx
+def part1(filename: str) -> int:
+    network = read_input(filename)
+    walker = Walker(network, network.ends(network.find("ZZZ")))
+    steps, _ = next(walker.walk(network.find("AAA")[0]))
+    return steps
 
 
 def part2(filename: str) -> int:
     # the trick here is each starting point hits a single ending point
     # with a fixed frequency. just need to calculate when those
     # frequencies align, which is the least common multiple
-    turns, nodes = read_input(filename)
+    network = read_input(filename)
+    walker = Walker(network, network.ends(network.find("Z")))
 
-    starting_nodes = set(
-        map(lambda x: x[:-2], filter(lambda x: x[-3] == "A", list(nodes.keys())))
-    )
+    cycle_lengths: list[int] = []
+    for start in network.find("A"):
+        hits = list(islice(walker.walk(start), 3))
 
-    cycle_legths: list[int] = []
+        # make sure each start location corresponds to exactly one end
+        # location, and that the cycle lengths are consistent
+        assert len({node for _, node in hits}) == 1
+        diffs = {second - first for (first, _), (second, _) in zip(hits, hits[1:])}
+        assert len(diffs) == 1
+        cycle_lengths.append(diffs.pop())
 
-    for name in starting_nodes:
-        idx, num_z = 0, 0
-        z_count: dict[str, list[int]] = {}
-        while True:
-            # set this to ~15 during testing, but set lower not to run
-            # faster while minimally keeping the checks
-            if num_z == 3:
-                # make sure each start locations corresponds to exactly
-                # one end location
-                assert len(z_count) == 1
-                z_diffs = [
-                    value[i + 1] - value[i]
-                    for value in z_count.values()
-                    for i in range(len(value) - 1)
-                ]
-                # check consistency of cycle lengths
-                # they appear to have same legnth with no burn-in
-                assert all([z_diffs[0] == z for z in z_diffs])
-                cycle_legths.append(z_diffs[0])
-                break
-
-            # walk the maze
-            turn = turns[idx % len(turns)]
-            name = nodes[name + "_" + turn]
-
-            # record endpoints for asserts above
-            if name[-1] == "Z":
-                num_z += 1
-                if name not in z_count:
-                    z_count[name] = [idx]
-                else:
-                    z_count[name].append(idx)
-
-            idx += 1
-
-    return lcm(*cycle_legths)
+    return lcm(*cycle_lengths)
 
 
 if __name__ == "__main__":
@@ -2,8 +2,10 @@ from itertools import pairwise
 from os.path import join
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
 
+@cached_input()
 def read_data(fileame: str) -> list[list[int]]:
     lines: list[list[int]] = []
     with open(join(DATA_DIR, fileame), "r") as fh:
@@ -1,10 +1,10 @@
 from array import array
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from os.path import join
 from typing import Callable
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input, codes
+from aoc2023.cache import cached_input
 
 
 class Direction(Enum):
@@ -61,14 +61,8 @@ def populate_moves():
         else:
             return Direction.North, num_cols
 
-    return {
-        "|": move_bar,
-        "-": move_dash,
-        "L": move_L,
-        "J": move_J,
-        "7": move_7,
-        "F": move_F,
-    }
+    pipes = codes("|-LJ7F")
+    return dict(zip(pipes, (move_bar, move_dash, move_L, move_J, move_7, move_F)))
 
 
 @dataclass
@@ -79,7 +73,7 @@ class Map:
     current_location: int
     map_: array
     prev_dir: Direction
-    moves: dict[str, MoveFn] = field(default_factory=populate_moves)
+    moves: dict[int, MoveFn] = field(default_factory=populate_moves)
 
     def move(self) -> None:
         pipe = self.map_[self.current_location]
@@ -95,18 +89,18 @@ class Map:
         return locations
 
 
-def read_data(filename: str, replacement: str) -> Map:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        lines = [list(line.strip()) for line in fh.read().strip().split("\n")]
+@cached_input(version=2)
+def read_grid(filename: str) -> tuple[int, int, array]:
+    with Input(filename) as data:
+        grid = data.grid()
+        return grid.num_rows, grid.num_cols, grid.to_array()
 
-    assert all([len(lines[0]) == len(line) for line in lines])
 
-    rows = len(lines)
-    cols = len(lines[0])
-    map_ = array("u", "".join("".join(line) for line in lines))
+def read_data(filename: str, replacement: str) -> Map:
+    rows, cols, map_ = read_grid(filename)
 
-    start_location = map_.index("S")
-    map_[start_location] = replacement
+    start_location = map_.index(ord("S"))
+    map_[start_location] = ord(replacement)
 
     # checking the inputs, the sample data replaces S with F and
     # the real data replaces S with |, so we just pick Direction.South
@@ -160,6 +154,10 @@ def part2(filename: str, replacement: str):
 
 
 if __name__ == "__main__":
+    from tempfile import TemporaryDirectory
+
+    from aoc2023.generate import write
+
     # in sample1, S = F
     # in sample2, S = F
     # in sample2, S = F
@@ -179,3 +177,7 @@ if __name__ == "__main__":
     assert part2("day10_sample5.txt", "F") == 8
     assert part2("day10_sample6.txt", "7") == 10
     assert part2("day10.txt", "|") == 495
+
+    # generated loops have to enclose something for part2 to be worth timing
+    with TemporaryDirectory() as directory:
+        assert part2(write(directory, 10, 50), "|") > 0
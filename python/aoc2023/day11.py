@@ -1,79 +1,43 @@
 from array import array
-from collections.abc import Iterator
-from dataclasses import dataclass
 from itertools import accumulate
-from os.path import join
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input, NDArray, make_ndarray
+from aoc2023.cache import cached_input
 
+DOT = ord(".")
 
-@dataclass
-class Map:
-    num_rows: int
-    num_cols: int
-    data: array
 
-    def iterrows(self) -> Iterator[array]:
-        step = 1
-        for row in range(self.num_rows):
-            start = row * self.num_cols
-            stop = start + self.num_cols
-            yield self.data[start:stop:step]
+@cached_input(version=2)
+def read_data(filename: str) -> NDArray[int]:
+    with Input(filename) as input_:
+        grid = input_.grid()
+        data = [0 if item == DOT else 1 for row in grid.iterrows() for item in row]
 
-    def itercols(self) -> Iterator[array]:
-        step = self.num_cols
-        for col in range(self.num_cols):
-            start = col
-            stop = start + self.num_cols * (self.num_rows - 1) + 1
-            yield self.data[start:stop:step]
-
-    def transpose(self) -> "Map":
-        num_rows, num_cols = self.num_cols, self.num_rows
-        data = array("H", [item for col in self.itercols() for item in col])
-        return Map(num_rows, num_cols, data)
-
-    def idx_to_row_col(self, idx: int) -> tuple[int, int]:
-        return divmod(idx, self.num_cols)
-
-    def row_col_to_idx(self, row: int, col: int) -> int:
-        return row * self.num_cols + col
-
-
-def read_data(filename: str) -> Map:
-    with open(join(DATA_DIR, filename)) as fh:
-        lines = [list(line) for line in fh.read().strip().split("\n")]
-
-    num_rows = len(lines)
-    num_cols = len(lines[0])
-    data = [0 if item == "." else 1 for line in lines for item in line]
+    num_rows = grid.num_rows
+    num_cols = grid.num_cols
     acc = accumulate(data)
     mao_ = array("H", [d * a for d, a in zip(data, acc)])
 
-    return Map(num_rows, num_cols, mao_)
+    return make_ndarray(num_rows, num_cols, mao_)
 
 
 def part1(filename: str, multiplier: int = 2) -> int:
     map_ = read_data(filename)
 
-    zero_rows: list[int] = []
-    for row, data in enumerate(map_.iterrows()):
-        if sum(data) == 0:
-            zero_rows.append(row)
-
-    zero_cols: list[int] = []
-    for col, data in enumerate(map_.itercols()):
-        if sum(data) == 0:
-            zero_cols.append(col)
+    zero_rows = [row for row, total in enumerate(map_.row_sums()) if total == 0]
+    zero_cols = [col for col, total in enumerate(map_.col_sums()) if total == 0]
 
     distances: dict[tuple[int, int], int] = {}
 
-    num_galaxies: int = max(map_.data)
+    # galaxies are numbered in row-major order, so the nonzero cells are
+    # galaxies 1, 2, ... in turn. one scan finds them all
+    galaxies = [map_.idx_to_row_col(idx) for idx in map_.nonzero()]
+
+    num_galaxies = len(galaxies)
     for g1 in range(1, num_galaxies):
-        idx1 = map_.data.index(g1)
-        row1, col1 = map_.idx_to_row_col(idx1)
+        row1, col1 = galaxies[g1 - 1]
         for g2 in range(g1 + 1, num_galaxies + 1):
-            idx2 = map_.data.index(g2)
-            row2, col2 = map_.idx_to_row_col(idx2)
+            row2, col2 = galaxies[g2 - 1]
 
             num_extra_cols = len(
                 list(filter(lambda x: min(col1, col2) < x < max(col1, col2), zero_cols))
@@ -2,7 +2,8 @@ from dataclasses import dataclass, field
 from itertools import pairwise
 from os.path import join
 
-from aoc2023 import DATA_DIR
+from aoc2023 import DATA_DIR, hot_path
+from aoc2023.cache import cached_input
 
 # i tried and failed to use dynamic programming to do this day. i found the repo here:
 # https://github.com/JoanaBLate/advent-of-code-js/blob/main/2023/day12/solve1.js
@@ -30,6 +31,7 @@ from aoc2023 import DATA_DIR
 #     return comb(wilds_tmp, len(blocks))
 
 
+@hot_path
 def is_good_location(row: str, start: int, length: int) -> bool:
     stop = start + length - 1
     if stop >= len(row):
@@ -181,6 +183,7 @@ class SpringRow:
         return self.count_good()
 
 
+@cached_input()
 def read_input(filename: str) -> list[SpringRow]:
     with open(join(DATA_DIR, filename), "r") as fh:
         lines = [line.split(" ") for line in fh.read().strip().split("\n")]
@@ -194,6 +197,7 @@ def part1(filename: str) -> int:
     return sum(row.count() for row in spring_rows)
 
 
+@cached_input()
 def read_input2(filename: str) -> list[SpringRow]:
     with open(join(DATA_DIR, filename), "r") as fh:
         lines = [line.split(" ") for line in fh.read().strip().split("\n")]
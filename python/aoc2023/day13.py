@@ -1,12 +1,13 @@
 from itertools import pairwise
-from os.path import join
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input
+from aoc2023.cache import cached_input
 
 
+@cached_input()
 def read_input(filename: str) -> tuple[list[list[str]], list[list[str]]]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        maps = [map.split() for map in fh.read().strip().split("\n\n")]
+    with Input(filename) as data:
+        maps = [str(map, "ascii").split() for map in data.paragraphs()]
 
     transposed = [
         [
@@ -80,8 +81,18 @@ def part2(filename: str) -> int:
 
 
 if __name__ == "__main__":
+    from tempfile import TemporaryDirectory
+
+    from aoc2023.generate import write
+
     assert part1("day13_sample.txt") == 405
     assert part1("day13.txt") == 31265
 
     assert part2("day13_sample.txt") == 400
     assert part2("day13.txt") == 39359
+
+    # generated patterns have an exact mirror and a smudged one
+    with TemporaryDirectory() as directory:
+        generated = write(directory, 13, 25)
+        assert part1(generated) > 0
+        assert part2(generated) > 0
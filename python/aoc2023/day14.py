@@ -1,49 +1,31 @@
-from array import array
-from itertools import pairwise
-from os.path import join
+from aoc2023 import Input, NDArray, codes, make_ndarray
+from aoc2023.cache import cached_input
 
-from aoc2023 import DATA_DIR, NDArray
+ROUND, CUBE, EMPTY = codes("O#.")
 
 
+@cached_input(version=3)
 def read_input(filename: str) -> NDArray:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        data = [list(line) for line in fh.read().strip().split("\n")]
+    with Input(filename) as data:
+        grid = data.grid()
+        return make_ndarray(grid.num_rows, grid.num_cols, grid.to_array())
 
-    rows, cols = len(data), len(data[0])
-    flat_data = [item for line in data for item in line]
 
-    return NDArray(rows, cols, array("u", flat_data))
-
-
-def tilt_col_north(arr: array) -> array:
-    cube_locations = (
-        [-1] + [idx for idx, item in enumerate(arr) if item == "#"] + [len(arr)]
-    )
-
-    for start, stop in pairwise(cube_locations):
-        num_round = arr[start + 1 : stop].count("O")
-        for idx, row in enumerate(range(start + 1, stop)):
-            arr[row] = "O" if idx < num_round else "."
-
-    return arr
+def tilt_north(arr: NDArray) -> NDArray:
+    return arr.settle(ROUND, EMPTY, CUBE)
 
 
-def tilt_north(arr: NDArray) -> NDArray:
-    cols = [tilt_col_north(col) for col in arr.itercols()]
-    cols = [item for c in cols for item in c]
-    data = array(arr._data.typecode, [col for cols in zip(cols) for col in cols])
-    return NDArray(arr.num_cols, arr.num_rows, data).transpose()
+def get_load(arr: NDArray) -> int:
+    load = 0
+    for idx, num_round in enumerate(arr.row_counts(ROUND)):
+        load += (arr.num_rows - idx) * num_round
+    return load
 
 
 def part1(filename: str) -> int:
     arr = read_input(filename)
     arr = tilt_north(arr)
-
-    load = 0
-    for idx, row in enumerate(arr.iterrows()):
-        load += (len(row) - idx) * row.count("O")
-
-    return load
+    return get_load(arr)
 
 
 def part2(filename: str) -> None:
@@ -63,10 +45,7 @@ def part2(filename: str) -> None:
             arr = arr.rotate_clockwise()
 
         # now start printing
-        load = 0
-        for idx, row in enumerate(arr.iterrows()):
-            load += (len(row) - idx) * row.count("O")
-        print(cycle, load)
+        print(cycle, get_load(arr))
 
     # visually inspect output to get cycle parameters
 
@@ -1,8 +1,10 @@
 from os.path import join
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
 
+@cached_input()
 def read_input(filename: str) -> list[str]:
     with open(join(DATA_DIR, filename), "r") as fh:
         return fh.read().strip().split(",")
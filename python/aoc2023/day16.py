@@ -1,10 +1,9 @@
 from array import array
-from copy import deepcopy
 from dataclasses import dataclass
 from enum import IntEnum
-from os.path import join
 
-from aoc2023 import DATA_DIR, NDArray
+from aoc2023 import Input, NDArray, codes, hot_path
+from aoc2023.cache import cached_input
 
 
 class Heading(IntEnum):
@@ -14,6 +13,40 @@ class Heading(IntEnum):
     Left = 3
 
 
+# the map is stored a byte per cell, so tiles are their ascii codes
+EMPTY, VERTICAL, HORIZONTAL, SLASH, BACKSLASH = codes(".|-/\\")
+
+
+def build_bounces() -> list[tuple[int, ...]]:
+    """BOUNCES[tile * 4 + heading] holds the headings a beam leaves tile
+    with when it enters heading that way, a splitter gives two
+    """
+    up, right, down, left = Heading
+    bounces: list[tuple[int, ...]] = [()] * (256 * 4)
+    for heading in Heading:
+        bounces[EMPTY * 4 + heading] = (heading,)
+        bounces[VERTICAL * 4 + heading] = (
+            (heading,) if heading in (up, down) else (up, down)
+        )
+        bounces[HORIZONTAL * 4 + heading] = (
+            (heading,) if heading in (left, right) else (left, right)
+        )
+    for heading, slash, backslash in (
+        (up, right, left),
+        (right, up, down),
+        (down, left, right),
+        (left, down, up),
+    ):
+        bounces[SLASH * 4 + heading] = (slash,)
+        bounces[BACKSLASH * 4 + heading] = (backslash,)
+    # plain ints so the hot loop never touches the enum
+    return [tuple(map(int, headings)) for headings in bounces]
+
+
+BOUNCES = build_bounces()
+UP, RIGHT, DOWN, LEFT = map(int, Heading)
+
+
 @dataclass
 class Location:
     idx: int
@@ -22,145 +55,91 @@ class Location:
 
 @dataclass
 class Route:
-    map_: NDArray[str]
+    """tiles is the map flattened to bytes, so the hot loop indexes it
+    directly. seen_locations has a byte per cell, with bit heading set once a
+    beam has passed through the cell going that way
+    """
+
+    map_: NDArray[int]
+    tiles: bytes
     locations: list[Location]
-    seen_locations: NDArray[int]
+    seen_locations: array
 
     def process_locations(self) -> None:
         while len(self.locations) > 0:
             route = self.locations.pop()
             self.process_location(route)
 
-    def get_next_location(self, location: None | Location) -> None | Location:
-        if location is None:
-            return None
-
-        row, col = self.map_.idx_to_row_col(location.idx)
-
-        match location.heading:
-            case Heading.Left:
-                if col == 0:
-                    return None
-                else:
-                    return Location(location.idx - 1, location.heading)
-            case Heading.Right:
-                if col == self.map_.num_cols - 1:
-                    return None
-                else:
-                    return Location(location.idx + 1, location.heading)
-            case Heading.Up:
-                if row == 0:
-                    return None
-                else:
-                    return Location(location.idx - self.map_.num_cols, location.heading)
-            case Heading.Down:
-                if row == self.map_.num_rows - 1:
-                    return None
-                else:
-                    return Location(location.idx + self.map_.num_cols, location.heading)
-            case _:
-                raise NotImplementedError
-
-    def move(self, location: None | Location) -> None | Location:
-        next_location = self.get_next_location(location)
-        if next_location is None:
-            return None
-
-        next_char: str = self.map_[next_location.idx]
-        match next_char, next_location.heading:
-            case ".", _:
-                return next_location
-
-            case "|", h if h in (Heading.Up, Heading.Down):
-                return next_location
-            case "|", h if h in (Heading.Left, Heading.Right):
-                next_location.heading = Heading.Up
-                self.locations.append(next_location)
-                next_location = deepcopy(next_location)
-                next_location.heading = Heading.Down
-                return next_location
-
-            case "-", h if h in (Heading.Left, Heading.Right):
-                return next_location
-            case "-", h if h in (Heading.Up, Heading.Down):
-                next_location.heading = Heading.Left
-                self.locations.append(next_location)
-                next_location = deepcopy(next_location)
-                next_location.heading = Heading.Right
-                return next_location
-
-            case "/", Heading.Up:
-                next_location.heading = Heading.Right
-                return next_location
-            case "/", Heading.Right:
-                next_location.heading = Heading.Up
-                return next_location
-            case "/", Heading.Down:
-                next_location.heading = Heading.Left
-                return next_location
-            case "/", Heading.Left:
-                next_location.heading = Heading.Down
-                return next_location
-
-            case "\\", Heading.Up:
-                next_location.heading = Heading.Left
-                return next_location
-            case "\\", Heading.Right:
-                next_location.heading = Heading.Down
-                return next_location
-            case "\\", Heading.Down:
-                next_location.heading = Heading.Right
-                return next_location
-            case "\\", Heading.Left:
-                next_location.heading = Heading.Up
-                return next_location
-
-            case _:
-                raise NotImplementedError
-
-    def process_location(self, location: None | Location) -> None:
-        while location is not None:
-            idx = location.idx * 4 + location.heading
-
-            if self.seen_locations[idx] == 0:
-                self.seen_locations._data[idx] = 1
-            elif self.seen_locations[idx] == 1:
-                break
+    @hot_path
+    def process_location(self, location: Location) -> None:
+        tiles, seen, bounces = self.tiles, self.seen_locations, BOUNCES
+        num_cols, num_tiles = self.map_.num_cols, len(tiles)
+        idx, heading = location.idx, int(location.heading)
+
+        while not seen[idx] >> heading & 1:
+            seen[idx] |= 1 << heading
+
+            if heading == UP:
+                idx -= num_cols
+                if idx < 0:
+                    return
+            elif heading == DOWN:
+                idx += num_cols
+                if idx >= num_tiles:
+                    return
+            elif heading == RIGHT:
+                if idx % num_cols == num_cols - 1:
+                    return
+                idx += 1
             else:
-                raise NotImplementedError
+                if idx % num_cols == 0:
+                    return
+                idx -= 1
 
-            location = self.move(location)
+            heading, *split = bounces[tiles[idx] * 4 + heading]
+            for other in split:
+                self.locations.append(Location(idx, Heading(other)))
 
+    def energized(self) -> int:
+        return len(self.seen_locations) - self.seen_locations.count(0)
 
-def read_input(filename: str, first_idx: int, first_heading: Heading) -> Route:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        lines = fh.read().strip().split("\n")
 
-    num_rows = len(lines)
-    num_cols = len(lines[0])
-    num_elements = len(lines) * len(lines[0])
+@cached_input(version=2)
+def read_map(filename: str) -> NDArray[int]:
+    with Input(filename) as data:
+        return data.grid().to_ndarray()
 
-    map_ = NDArray(
-        num_rows, num_cols, array("u", [item for line in lines for item in line])
-    )
 
-    num_cols = 4
-    seen_routes = NDArray(num_elements, 4, array("H", [0] * num_elements * num_cols))
+def flatten(map_: NDArray[int]) -> bytes:
+    return b"".join(bytes(row) for row in map_.iterrows())
+
 
-    return Route(map_, [Location(first_idx, first_heading)], seen_routes)
+def new_route(
+    map_: NDArray[int], tiles: bytes, first_idx: int, first_heading: Heading
+) -> Route:
+    # routes only read the map, so every one can share the same parsed and
+    # flattened copy
+    seen_routes = array("B", bytes(len(map_)))
+    return Route(map_, tiles, [Location(first_idx, first_heading)], seen_routes)
+
+
+def read_input(filename: str, first_idx: int, first_heading: Heading) -> Route:
+    map_ = read_map(filename)
+    return new_route(map_, flatten(map_), first_idx, first_heading)
 
 
 def part1(filename: str, first_idx: int, first_heading: Heading) -> int:
     routes = read_input(filename, first_idx, first_heading)
     routes.process_locations()
-    return sum([1 if sum(row) > 0 else 0 for row in routes.seen_locations.iterrows()])
+    return routes.energized()
 
 
 def part2(filename: str) -> int:
-    routes = read_input(filename, 0, Heading.Down)
+    map_ = read_map(filename)
+    tiles = flatten(map_)
 
-    num_rows = routes.map_.num_rows
-    num_cols = routes.map_.num_cols
+    num_rows = map_.num_rows
+    num_cols = map_.num_cols
 
     starts = (
         [Location(idx, Heading.Down) for idx in range(num_cols)]
@@ -180,11 +159,9 @@ def part2(filename: str) -> int:
 
     lengths = []
     for location in starts:
-        routes = read_input(filename, location.idx, location.heading)
+        routes = new_route(map_, tiles, location.idx, location.heading)
         routes.process_locations()
-        lengths.append(
-            sum([1 if sum(row) > 0 else 0 for row in routes.seen_locations.iterrows()])
-        )
+        lengths.append(routes.energized())
 
     return max(lengths)
 
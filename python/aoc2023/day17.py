@@ -2,19 +2,20 @@ from collections import defaultdict
 from heapq import heappop, heappush
 from itertools import chain
 from math import inf
-from os.path import join
 from typing import Iterator
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input, hot_path
+from aoc2023.cache import cached_input
 
 Grid = list[list[int]]
 
 
+@cached_input()
 def read_input(filename: str) -> list[list[int]]:
-    with open(join(DATA_DIR, filename)) as fh:
-        return [
-            list(map(int, list(row.strip()))) for row in fh.read().strip().split("\n")
-        ]
+    # the rows are ascii digits, so each byte less ord("0") is the weight
+    zero = ord("0")
+    with Input(filename) as data:
+        return [[c - zero for c in row] for row in data.grid().iterrows()]
 
 
 # incorporated straight_line as done here:
@@ -48,6 +49,7 @@ def straight_line(
             yield row, col, weight
 
 
+@hot_path
 def get_neighbors(
     grid: Grid,
     row: int,
@@ -3,6 +3,7 @@ from enum import StrEnum
 from os.path import join
 
 from aoc2023 import DATA_DIR
+from aoc2023.cache import cached_input
 
 
 class Direction(StrEnum):
@@ -19,6 +20,7 @@ class Step:
     color: str
 
 
+@cached_input()
 def read_input(filename: str) -> list[Step]:
     with open(join(DATA_DIR, filename)) as fh:
         lines = fh.read().strip().split("\n")
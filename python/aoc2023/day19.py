@@ -1,15 +1,18 @@
 from math import prod
-from os.path import join
 
-from aoc2023 import DATA_DIR
+from aoc2023 import Input, Range
+from aoc2023.cache import cached_input
 
 
+@cached_input(version=2)
 def read_input(filename: str):
-    with open(join(DATA_DIR, filename), "r") as fh:
-        workflow_section, part_section = fh.read().strip().split("\n\n")
+    with Input(filename) as data:
+        workflow_section, part_section = (
+            str(section, "ascii") for section in data.paragraphs()
+        )
 
     workflows = {}
-    for workflow_str in workflow_section.split("\n"):
+    for workflow_str in workflow_section.splitlines():
         name, rest = workflow_str[:-1].split("{")
 
         steps = []
@@ -25,11 +28,11 @@ def read_input(filename: str):
         workflows[name] = steps
 
     parts = []
-    for part_str in part_section.split("\n"):
+    for part_str in part_section.splitlines():
         part = {}
         for parameter, value in zip("xmas", part_str[1:-1].split(",")):
             v = int(value[2:])
-            part[parameter] = range(v, v)
+            part[parameter] = Range(v, v + 1)
         parts.append(part)
 
     return workflows, parts
@@ -78,34 +81,55 @@ def score_parts(queue: list[tuple[str, dict]], workflows: dict):
     while queue:
         current_location, part = queue.pop()
         if current_location == "A":
-            yield prod(len(part[c]) + 1 for c in "xmas")
+            yield prod(len(part[c]) for c in "xmas")
         elif current_location != "R":
             for parameter, op_str, value, target in workflows[current_location]:
                 match op_str:
                     case None:
                         queue.append((target, part.copy()))
                     case ">":
-                        r = part[parameter]
-                        part[parameter] = range(1 + max(r.start, value), r.stop)
-                        queue.append((target, part.copy()))
-                        part[parameter] = range(r.start, min(r.stop, value))
+                        rejected, accepted = part[parameter].split_at(value + 1)
+                        if accepted:
+                            queue.append((target, part | {parameter: accepted}))
+                        part[parameter] = rejected
                     case "<":
-                        r = part[parameter]
-                        part[parameter] = range(r.start, min(r.stop, value) - 1)
-                        queue.append((target, part.copy()))
-                        part[parameter] = range(max(r.start, value), r.stop)
+                        accepted, rejected = part[parameter].split_at(value)
+                        if accepted:
+                            queue.append((target, part | {parameter: accepted}))
+                        part[parameter] = rejected
+
+
+def count_accepted(workflows: dict) -> int:
+    part = {c: Range(1, 4001) for c in "xmas"}
+    return sum(score_parts([("in", part)], workflows))
 
 
 def part2(filename: str) -> int:
     workflows, _ = read_input(filename)
-
-    part = {c: range(1, 4000) for c in "xmas"}
-    return sum(score_parts([("in", part)], workflows))
+    return count_accepted(workflows)
 
 
 if __name__ == "__main__":
+    from os.path import join
+    from tempfile import TemporaryDirectory
+
+    from aoc2023 import DATA_DIR
+
     assert part1("day19_sample.txt") == 19114
     assert part1("day19.txt") == 397061
 
     assert part2("day19_sample.txt") == 167409079868000
     assert part2("day19.txt") == 125657431183201
+
+    # the same sample with windows line endings
+    with TemporaryDirectory() as directory:
+        crlf = join(directory, "day19_sample_crlf.txt")
+        with open(join(DATA_DIR, "day19_sample.txt"), "rb") as src:
+            with open(crlf, "wb") as dst:
+                dst.write(src.read().replace(b"\n", b"\r\n"))
+        assert part1(crlf) == 19114
+        assert part2(crlf) == 167409079868000
+
+    # x<2000 and x>1999 split at 2000, together they accept all 4000 values
+    boundary = [("x", "<", 2000, "A"), ("x", ">", 1999, "A"), (None, None, None, "R")]
+    assert count_accepted({"in": boundary}) == 4000**4
@@ -4,7 +4,7 @@ from os.path import join
 from queue import Queue
 from typing import Callable
 
-from aoc2023 import DATA_DIR
+from aoc2023 import DATA_DIR, hot_path
 
 
 class Pulse(IntEnum):
@@ -81,6 +81,7 @@ def get_broadcaster(name: str, outgoing: list[str]) -> ProcessPulse:
     return process_pulse
 
 
+@hot_path
 def press_button(nodes: dict[str, ProcessPulse], idx: int) -> tuple[int, int]:
     q = Queue()
     q = nodes["broadcaster"]("", Pulse.Low, q)
@@ -101,7 +102,6 @@ def press_button(nodes: dict[str, ProcessPulse], idx: int) -> tuple[int, int]:
         else:
             high_count += 1
 
-        # print(name, next_node, pulse)
         nodes[next_node](name, pulse, q)
 
     return low_count, high_count
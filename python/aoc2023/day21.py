@@ -1,30 +1,24 @@
-from array import array
 from collections import deque
 from copy import deepcopy
-from os.path import join
 
-from aoc2023 import DATA_DIR, NDArray
+from aoc2023 import Input, NDArray, codes, hot_path
+from aoc2023.cache import cached_input
 
+GARDEN, ROCK, START = codes(".#S")
 
-def read_input(filename: str) -> tuple[NDArray, int]:
-    with open(join(DATA_DIR, filename), "r") as fh:
-        rows = fh.read().strip().split()
-
-    num_rows, num_cols = len(rows), len(rows[0])
 
-    start_idx = -1
+@cached_input(version=2)
+def read_input(filename: str) -> tuple[NDArray, int]:
+    with Input(filename) as data:
+        arr = data.grid().to_ndarray()
 
-    arr = []
-    for row_idx, row in enumerate(rows):
-        for col_idx, value in enumerate(row):
-            if value == "S":
-                start_idx = row_idx * num_cols + col_idx
-                value = "."
-            arr.append(value)
+    start_idx = arr.find(START)
+    arr[start_idx] = GARDEN
 
-    return NDArray(num_rows, num_cols, array("u", arr)), start_idx
+    return arr, start_idx
 
 
+@hot_path
 def process_moves(grid: NDArray, start_idx: int, num_steps: int) -> int:
     """idea to use a single grid and keep grtd index came from:
     https://github.com/derailed-dash/Advent-of-Code/blob/master/src/AoC_2023/Dazbo's_Advent_of_Code_2023.ipynb
@@ -48,10 +42,6 @@ def process_moves(grid: NDArray, start_idx: int, num_steps: int) -> int:
 
             if steps > 0:
                 row, col = grid.idx_to_row_col(idx)
-                # print(steps, grid_x, grid_y, idx, row, col)
-
-                # if steps < 40:
-                #     break
 
                 neighbors = (
                     (row - 1, col),
@@ -92,8 +82,7 @@ def process_moves(grid: NDArray, start_idx: int, num_steps: int) -> int:
 
                     if (new_grid_x, new_grid_y, new_idx) in seen or grid[
                         new_idx
-                    ] == "#":
-                        # print(grid_x, grid_y, idx, grid[idx])
+                    ] == ROCK:
                         continue
 
                     if abs(grid_x) > grids_for_steps:
@@ -116,10 +105,9 @@ def print_locations(arr: NDArray, locations: set[int]) -> None:
     arr = deepcopy(arr)
 
     for location in locations:
-        arr._data[location] = "0"
+        arr[location] = ord("0")
 
-    for row in arr.iterrows():
-        print("".join(row))
+    print(arr)
 
 
 def part1(filename: str, num_steps: int) -> int:
@@ -0,0 +1,559 @@
+"""synthetic inputs for every day at any scale, e.g.
+
+    python -m aoc2023.generate 3 10000 > day03_big.txt
+
+each generator takes a size and a seeded Random and returns the file's
+contents. what size measures differs per day, see GENERATORS
+"""
+import os
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from itertools import count
+from random import Random
+from string import ascii_lowercase
+from typing import Any, Callable, Iterator
+
+from aoc2023.runner import Case
+
+DEFAULT_SEED = 2023
+
+WORDS = ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+CARDS = "23456789TJQKA"
+RESERVED = frozenset(("in", "rx", "output", "broadcaster"))
+
+
+def names(alphabet: str = ascii_lowercase, width: int = 2) -> Iterator[str]:
+    """unique names, widening once every name of the current width is used"""
+    for width in count(width):
+        for idx in range(len(alphabet) ** width):
+            name = ""
+            for _ in range(width):
+                idx, digit = divmod(idx, len(alphabet))
+                name += alphabet[digit]
+            if name not in RESERVED:
+                yield name
+
+
+def day01(size: int, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(size):
+        pieces = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(2, 8)):
+            match rng.randrange(3):
+                case 0:
+                    pieces.append(str(rng.randint(1, 9)))
+                case 1:
+                    pieces.append(rng.choice(WORDS))
+                case _:
+                    pieces.append("".join(rng.choices(ascii_lowercase, k=3)))
+        rng.shuffle(pieces)
+        lines.append("".join(pieces))
+    return "\n".join(lines)
+
+
+def day02(size: int, rng: Random) -> str:
+    lines: list[str] = []
+    for game in range(1, size + 1):
+        rounds: list[str] = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(("red", "green", "blue"), rng.randint(1, 3))
+            rounds.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {game}: " + "; ".join(rounds))
+    return "\n".join(lines)
+
+
+def day03(size: int, rng: Random) -> str:
+    grid = [bytearray(b"." * size) for _ in range(size)]
+    number_at: dict[tuple[int, int], int] = {}
+
+    for row in range(size):
+        col = rng.randrange(4)
+        while col < size - 3:
+            if rng.random() < 0.3:
+                number = str(rng.randint(1, 999)).encode()
+                grid[row][col : col + len(number)] = number
+                for offset in range(len(number)):
+                    number_at[(row, col + offset)] = len(number_at)
+                col += len(number)
+            elif rng.random() < 0.1:
+                grid[row][col] = rng.choice(b"*#+$/@=%&-")
+            col += rng.randint(1, 4)
+
+    # day03 expects a gear to touch at most two numbers
+    for row in range(size):
+        for col in range(size):
+            if grid[row][col] == ord("*"):
+                touching = {
+                    number_at[(r, c)]
+                    for r in range(row - 1, row + 2)
+                    for c in range(col - 1, col + 2)
+                    if (r, c) in number_at
+                }
+                if len(touching) > 2:
+                    grid[row][col] = ord("#")
+
+    return "\n".join(row.decode() for row in grid)
+
+
+def day04(size: int, rng: Random) -> str:
+    lines: list[str] = []
+    for card in range(1, size + 1):
+        # copies can't run past the last card
+        num_matching = min(rng.choice((0, 0, 1, 2, 3, 5, 10)), size - card)
+        winning = rng.sample(range(1, 100), 10)
+        others = [n for n in range(1, 100) if n not in winning]
+        numbers = winning[:num_matching] + rng.sample(others, 25 - num_matching)
+        rng.shuffle(numbers)
+        lines.append(
+            f"Card {card:>3}: "
+            + " ".join(f"{n:>2}" for n in winning)
+            + " | "
+            + " ".join(f"{n:>2}" for n in numbers)
+        )
+    return "\n".join(lines)
+
+
+def day05(size: int, rng: Random) -> str:
+    top = 2**32
+    seeds: list[int] = []
+    for _ in range(10):
+        start = rng.randrange(top - 2**28)
+        seeds += [start, rng.randint(1, 2**28)]
+
+    sections = ["seeds: " + " ".join(map(str, seeds))]
+    headers = ("seed", "soil", "fertilizer", "water", "light", "temperature")
+    headers += ("humidity", "location")
+    for source, dest in zip(headers, headers[1:]):
+        # cut the space into pieces and lay them out again in another order
+        cuts = sorted(rng.sample(range(1, top), size - 1))
+        pieces = list(zip([0] + cuts, cuts + [top]))
+        dest_order = pieces[:]
+        rng.shuffle(dest_order)
+
+        dest_starts: dict[tuple[int, int], int] = {}
+        start = 0
+        for piece in dest_order:
+            dest_starts[piece] = start
+            start += piece[1] - piece[0]
+
+        rng.shuffle(pieces)
+        lines = [f"{source}-to-{dest} map:"]
+        for piece in pieces:
+            lines.append(f"{dest_starts[piece]} {piece[0]} {piece[1] - piece[0]}")
+        sections.append("\n".join(lines))
+
+    return "\n\n".join(sections)
+
+
+def day06(size: int, rng: Random) -> str:
+    times = [rng.randint(size // 2 + 2, size + 2) for _ in range(4)]
+    distances = [rng.randint(1, t * t // 4 - 1) for t in times]
+    time_line = "Time:     " + " ".join(f"{t:>6}" for t in times)
+    distance_line = "Distance: " + " ".join(f"{d:>6}" for d in distances)
+    return time_line + "\n" + distance_line
+
+
+def day07(size: int, rng: Random) -> str:
+    # the puzzle never repeats a hand, so redraw on a collision
+    size = min(size, len(CARDS) ** 5)
+    seen: set[str] = set()
+    lines: list[str] = []
+    while len(lines) < size:
+        cards = "".join(rng.choices(CARDS, k=5))
+        if cards not in seen:
+            seen.add(cards)
+            lines.append(f"{cards} {rng.randint(1, 1000)}")
+    return "\n".join(lines)
+
+
+def day08(size: int, rng: Random) -> str:
+    # every ghost walks its own ring, so each start meets exactly one end
+    # and always after the same number of steps, as day08 expects
+    turns = "".join(rng.choices("LR", k=rng.randint(5, 300)))
+    middle = names("BCDEFGHIJKLMNOPQRSTUVWXY", width=3)
+    prefixes = names("BCDEFGHIJKLMNOPQRSTUVWXY", width=2)
+
+    num_ghosts = 6
+    lines: list[str] = []
+    for ghost in range(num_ghosts):
+        prefix = "AA" if ghost == 0 else next(prefixes)
+        start = prefix + "A"
+        end = "ZZZ" if ghost == 0 else prefix + "Z"
+        ring = [next(middle) for _ in range(max(2, size // num_ghosts - 2))]
+
+        path = [start] + ring + [end, ring[0]]
+        for node, next_node in zip(path, path[1:]):
+            lines.append(f"{node} = ({next_node}, {next_node})")
+
+    rng.shuffle(lines)
+    return turns + "\n\n" + "\n".join(lines)
+
+
+def day09(size: int, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 7))]
+        values = [
+            sum(c * x**power for power, c in enumerate(coefficients))
+            for x in range(21)
+        ]
+        lines.append(" ".join(map(str, values)))
+    return "\n".join(lines)
+
+
+PIPES = {
+    frozenset("NS"): "|",
+    frozenset("EW"): "-",
+    frozenset("NE"): "L",
+    frozenset("NW"): "J",
+    frozenset("SW"): "7",
+    frozenset("SE"): "F",
+}
+
+
+def day10(size: int, rng: Random) -> str:
+    """a loop around the edge of the grid, with notches pushed up into it
+    from the bottom edge every few columns. the tiles between the notches
+    and under the top edge are enclosed, junk pipes included. S is on the
+    left-hand column where it stands in for "|"
+    """
+    size = max(size, 6)
+    grid = [[rng.choice("|-LJ7F.") for _ in range(size)] for _ in range(size)]
+
+    top, bottom, left, right = 1, size - 2, 1, size - 2
+
+    loop = [(top, col) for col in range(left, right + 1)]
+    loop += [(row, right) for row in range(top + 1, bottom + 1)]
+    col = right - 1
+    while col > left:
+        if (right - col) % 4 == 2 and col - 1 > left:
+            # up one column and back down the next, leaving the row under
+            # the top edge open so the inside stays in one piece
+            peak = rng.randint(top + 2, bottom - 1)
+            loop += [(row, col) for row in range(bottom, peak - 1, -1)]
+            loop += [(row, col - 1) for row in range(peak, bottom + 1)]
+            col -= 2
+        else:
+            loop.append((bottom, col))
+            col -= 1
+    loop += [(row, left) for row in range(bottom, top, -1)]
+
+    for prev, (row, col), next_ in zip(
+        loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]
+    ):
+        sides = set()
+        for r, c in (prev, next_):
+            sides.add("N" if r < row else "S" if r > row else "W" if c < col else "E")
+        grid[row][col] = PIPES[frozenset(sides)]
+
+    grid[(top + bottom) // 2][left] = "S"
+    return "\n".join("".join(row) for row in grid)
+
+
+def day11(size: int, rng: Random) -> str:
+    empty_rows = set(rng.sample(range(size), size // 20))
+    empty_cols = set(rng.sample(range(size), size // 20))
+
+    grid = [["."] * size for _ in range(size)]
+    for row in range(size):
+        for col in range(size):
+            if row in empty_rows or col in empty_cols:
+                continue
+            if rng.random() < 0.02:
+                grid[row][col] = "#"
+
+    # at least one pair of galaxies
+    grid[0][0] = grid[size - 1][size - 1] = "#"
+    return "\n".join("".join(row) for row in grid)
+
+
+def day12(size: int, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(50):
+        springs = [rng.choice("..#") for _ in range(size)]
+        springs[rng.randrange(size)] = "#"
+        blocks = [len(b) for b in "".join(springs).split(".") if b]
+        row = "".join("?" if rng.random() < 0.4 else s for s in springs)
+        lines.append(row + " " + ",".join(map(str, blocks)))
+    return "\n".join(lines)
+
+
+def day13(size: int, rng: Random) -> str:
+    size = max(size, 3)
+    patterns: list[str] = []
+    for _ in range(20):
+        # an exact mirror between columns for part1, and a mirror between
+        # rows for part2 that's off by one smudged cell. the smudge goes in
+        # a column with no partner across the column mirror, so that one
+        # stays exact
+        col_mirror = rng.randint(1, (size - 1) // 2)
+        row_mirror = rng.randint(1, size - 1)
+        rows = [rng.choices("#.", k=size) for _ in range(size)]
+        for row in rows:
+            for col in range(col_mirror, 2 * col_mirror):
+                row[col] = row[2 * col_mirror - 1 - col]
+        for idx in range(row_mirror, min(2 * row_mirror, size)):
+            rows[idx] = rows[2 * row_mirror - 1 - idx].copy()
+
+        row = rng.randrange(row_mirror, min(2 * row_mirror, size))
+        col = rng.randrange(2 * col_mirror, size)
+        rows[row][col] = "." if rows[row][col] == "#" else "#"
+
+        if rng.random() < 0.5:
+            rows = [list(col) for col in zip(*rows)]
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns)
+
+
+def day14(size: int, rng: Random) -> str:
+    return "\n".join(
+        "".join(rng.choices("O#.", weights=(2, 1, 5), k=size)) for _ in range(size)
+    )
+
+
+def day15(size: int, rng: Random) -> str:
+    labels = ["".join(rng.choices(ascii_lowercase, k=rng.randint(2, 6)))]
+    labels += ["".join(rng.choices(ascii_lowercase, k=rng.randint(2, 6)))]
+    labels += [
+        "".join(rng.choices(ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(size // 4)
+    ]
+
+    steps: list[str] = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        steps.append(label + ("-" if rng.random() < 0.3 else f"={rng.randint(1, 9)}"))
+    return ",".join(steps)
+
+
+def day16(size: int, rng: Random) -> str:
+    return "\n".join(
+        "".join(rng.choices(".|-/\\", weights=(30, 1, 1, 1, 1), k=size))
+        for _ in range(size)
+    )
+
+
+def day17(size: int, rng: Random) -> str:
+    return "\n".join("".join(rng.choices("123456789", k=size)) for _ in range(size))
+
+
+def day18(size: int, rng: Random) -> str:
+    """two histogram shaped polygons with size columns, one written as the
+    directions and the other hidden in the colours
+    """
+
+    def histogram(max_step: int) -> list[tuple[str, int]]:
+        heights = [rng.randint(1, max_step)]
+        while len(heights) < size:
+            height = rng.randint(1, max_step)
+            if height != heights[-1]:
+                heights.append(height)
+
+        steps = [("U", heights[0])]
+        widths = [rng.randint(1, max_step) for _ in heights]
+        for idx, width in enumerate(widths):
+            steps.append(("R", width))
+            if idx + 1 < len(heights):
+                diff = heights[idx + 1] - heights[idx]
+                steps.append(("U" if diff > 0 else "D", abs(diff)))
+        steps += [("D", heights[-1]), ("L", sum(widths))]
+        return steps
+
+    codes = {"R": 0, "D": 1, "L": 2, "U": 3}
+    lines: list[str] = []
+    for (direction, distance), (hidden, hidden_distance) in zip(
+        histogram(20), histogram(0xFFFFF // (size + 1))
+    ):
+        color = f"{hidden_distance:05x}{codes[hidden]}"
+        lines.append(f"{direction} {distance} (#{color})")
+    return "\n".join(lines)
+
+
+def day19(size: int, rng: Random) -> str:
+    # workflows form a tree below "in", so every part ends in A or R
+    fresh = names()
+    queue = ["in"]
+    num_workflows = 1
+
+    workflows: list[str] = []
+    while queue:
+        name = queue.pop()
+
+        targets: list[str] = []
+        for _ in range(rng.randint(2, 4)):
+            if num_workflows < size and rng.random() < 0.6:
+                targets.append(next(fresh))
+                queue.append(targets[-1])
+                num_workflows += 1
+            else:
+                targets.append(rng.choice("AR"))
+
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        workflows.append(name + "{" + ",".join(rules + targets[-1:]) + "}")
+
+    parts = [
+        "{" + ",".join(f"{c}={rng.randint(1, 4000)}" for c in "xmas") + "}"
+        for _ in range(size)
+    ]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts)
+
+
+def day20(size: int, rng: Random) -> str:
+    """size 12 bit counters, each a chain of flip-flops with a hub
+    conjunction, all feeding rx like the real input
+    """
+    fresh = names()
+    final = next(fresh)
+    starts: list[str] = []
+    lines: list[str] = []
+
+    for _ in range(size):
+        period = rng.randrange(2**11 + 1, 2**12, 2)
+        flip_flops = [next(fresh) for _ in range(12)]
+        hub, inverter = next(fresh), next(fresh)
+        starts.append(flip_flops[0])
+
+        hub_targets = [flip_flops[0]]
+        for bit, flip_flop in enumerate(flip_flops):
+            targets = flip_flops[bit + 1 : bit + 2]
+            if period >> bit & 1:
+                targets.append(hub)
+            elif bit:
+                hub_targets.append(flip_flop)
+            lines.append(f"%{flip_flop} -> " + ", ".join(targets))
+
+        lines.append(f"&{hub} -> " + ", ".join(hub_targets + [inverter]))
+        lines.append(f"&{inverter} -> {final}")
+
+    lines.append(f"&{final} -> rx")
+    lines.append("broadcaster -> " + ", ".join(starts))
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day21(size: int, rng: Random) -> str:
+    """an odd sized garden with S in the middle and its row and column clear"""
+    size += 1 - size % 2
+    middle = size // 2
+    grid = [
+        ["#" if rng.random() < 0.1 else "." for _ in range(size)] for _ in range(size)
+    ]
+    for idx in range(size):
+        grid[middle][idx] = grid[idx][middle] = "."
+    grid[middle][middle] = "S"
+    return "\n".join("".join(row) for row in grid)
+
+
+def filename_args(path: str, size: int) -> tuple[Any, ...]:
+    return (path,)
+
+
+@dataclass(frozen=True)
+class Generator:
+    fn: Callable[[int, Random], str]
+    # what size measures, and the sizes a sweep runs by default
+    unit: str
+    sizes: tuple[int, ...]
+    # the parts to run on a generated file, with their arguments
+    parts: tuple[tuple[int, Callable[[str, int], tuple[Any, ...]]], ...] = (
+        (1, filename_args),
+        (2, filename_args),
+    )
+
+    @property
+    def day(self) -> int:
+        return int(self.fn.__name__[3:])
+
+    def cases(self, path: str, size: int) -> list[Case]:
+        return [
+            Case(self.day, part, args(path, size), sample=False)
+            for part, args in self.parts
+        ]
+
+
+# day14.part2 and day20.part2 are inspection runs of a fixed number of
+# cycles, and day21.part2 needs the real input's geometry, so they're left out
+GENERATORS: dict[int, Generator] = {
+    g.day: g
+    for g in (
+        Generator(day01, "lines", (1000, 4000, 16000, 64000)),
+        Generator(day02, "games", (1000, 4000, 16000, 64000)),
+        Generator(day03, "rows and columns", (100, 200, 400, 800)),
+        Generator(day04, "cards", (1000, 4000, 16000, 64000)),
+        Generator(day05, "ranges per map", (100, 400, 1600, 6400)),
+        Generator(
+            day06,
+            "race time",
+            (10**3, 10**6, 10**12, 10**24),
+            ((1, filename_args), (2, lambda _, size: (size, size * size // 5))),
+        ),
+        Generator(day07, "hands", (1000, 4000, 16000, 64000)),
+        Generator(day08, "nodes", (1000, 4000, 16000, 64000)),
+        Generator(day09, "lines", (200, 800, 3200, 12800)),
+        Generator(
+            day10,
+            "rows and columns",
+            (50, 100, 200, 400),
+            ((1, lambda path, _: (path, "|")), (2, lambda path, _: (path, "|"))),
+        ),
+        Generator(
+            day11,
+            "rows and columns",
+            (20, 40, 80, 160),
+            ((1, filename_args), (2, lambda path, _: (path, 10**6))),
+        ),
+        Generator(day12, "springs per row", (10, 20, 40, 80)),
+        Generator(day13, "rows and columns", (25, 50, 100, 200)),
+        Generator(
+            day14, "rows and columns", (100, 200, 400, 800), ((1, filename_args),)
+        ),
+        Generator(day15, "steps", (4000, 16000, 64000, 256000)),
+        Generator(
+            day16,
+            "rows and columns",
+            (10, 20, 40, 80),
+            ((1, lambda path, _: (path, 0, 1)), (2, filename_args)),
+        ),
+        Generator(day17, "rows and columns", (25, 50, 100, 200)),
+        Generator(day18, "columns", (100, 1000, 10000, 100000)),
+        Generator(day19, "workflows", (100, 400, 1600, 6400)),
+        Generator(day20, "counters", (2, 4, 8, 16), ((1, filename_args),)),
+        Generator(
+            day21,
+            "rows and columns",
+            (11, 21, 41, 81),
+            ((1, lambda path, size: (path, size)),),
+        ),
+    )
+}
+
+
+def generate(day: int, size: int, seed: int = DEFAULT_SEED) -> str:
+    # seeded per day and size so each file is reproducible on its own
+    rng = Random(f"{seed}-{day}-{size}")
+    return GENERATORS[day].fn(size, rng) + "\n"
+
+
+def write(directory: str, day: int, size: int, seed: int = DEFAULT_SEED) -> str:
+    """writes the input to directory and returns its absolute path, which the
+    days accept in place of a filename under DATA_DIR
+    """
+    path = os.path.abspath(os.path.join(directory, f"day{day:02}_{size}_{seed}.txt"))
+    with open(path, "w") as fh:
+        fh.write(generate(day, size, seed))
+    return path
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="python -m aoc2023.generate", description="print a synthetic input"
+    )
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    print(generate(args.day, args.size, args.seed), end="")
@@ -0,0 +1,124 @@
+from array import array
+from typing import Any, Iterator
+
+import numpy as np
+
+from aoc2023 import NDArray
+
+
+class NumpyNDArray(NDArray):
+    """NDArray served by a 2d numpy array. numpy slicing already gives
+    strided views, so the offset/stride fields are unused. rows and columns
+    are still handed out as `array`s so callers see the same api
+    """
+
+    def __init__(self, data: np.ndarray) -> None:
+        assert data.ndim == 2
+        self._data = data  # type: ignore[assignment]
+        self.num_rows, self.num_cols = data.shape
+        self.offset, self.row_stride, self.col_stride = 0, self.num_cols, 1
+        self._contiguous = False
+
+    @classmethod
+    def from_array(cls, num_rows: int, num_cols: int, data: array) -> "NumpyNDArray":
+        # shares the array's buffer rather than copying it
+        return cls(np.frombuffer(data, dtype=data.typecode).reshape(num_rows, num_cols))
+
+    def __repr__(self) -> str:
+        if self.typecode() == "B":
+            return "\n".join(row.tobytes().decode("latin-1") for row in self._data)
+        return "\n".join("".join(map(str, row.tolist())) for row in self._data)
+
+    def typecode(self) -> str:
+        return self._data.dtype.char
+
+    def __getitem__(self, item: int) -> Any:
+        return self._data.item(item)
+
+    def __setitem__(self, item: int, value: Any) -> None:
+        self._data[divmod(item, self.num_cols)] = value
+
+    def iterrows(self) -> Iterator[array]:
+        typecode = self.typecode()
+        for row in self._data:
+            yield array(typecode, row.tobytes())
+
+    def itercols(self) -> Iterator[array]:
+        typecode = self.typecode()
+        for col in self._data.T:
+            yield array(typecode, col.tobytes())
+
+    def count(self, value: Any) -> int:
+        return int(np.count_nonzero(self._data == value))
+
+    def row_counts(self, value: Any) -> list[int]:
+        return np.count_nonzero(self._data == value, axis=1).tolist()
+
+    def col_counts(self, value: Any) -> list[int]:
+        return np.count_nonzero(self._data == value, axis=0).tolist()
+
+    def row_sums(self) -> list[int]:
+        return self._data.sum(axis=1, dtype=np.int64).tolist()
+
+    def col_sums(self) -> list[int]:
+        return self._data.sum(axis=0, dtype=np.int64).tolist()
+
+    def find(self, value: Any, start: int = 0) -> int:
+        found = np.flatnonzero(self._data.ravel()[start:] == value)
+        return start + int(found[0]) if len(found) else -1
+
+    def nonzero(self) -> list[int]:
+        return np.flatnonzero(self._data).tolist()
+
+    def settle(self, mover: Any, empty: Any, wall: Any) -> "NumpyNDArray":
+        data = self._data
+        walls = data == wall
+
+        # every cell's distance below the nearest wall above it (or the edge)
+        rows = np.arange(self.num_rows)[:, None]
+        last_wall = np.maximum.accumulate(np.where(walls, rows, -1), axis=0)
+        depth = rows - last_wall - 1
+
+        # each (column, run between walls) pair gets its own bin for counting
+        cols = np.arange(self.num_cols)[None, :]
+        run = np.cumsum(walls, axis=0) * self.num_cols + cols
+        movers = np.bincount(
+            run[data == mover], minlength=(self.num_rows + 1) * self.num_cols
+        )
+
+        settled = np.where(depth < movers[run], mover, empty)
+        return NumpyNDArray(np.where(walls, wall, settled).astype(data.dtype))
+
+    def copy(self) -> "NumpyNDArray":
+        return NumpyNDArray(self._data.copy())
+
+    def contiguous(self) -> "NumpyNDArray":
+        return self if self._data.flags.c_contiguous else self.copy()
+
+    def transpose(self) -> "NumpyNDArray":
+        return NumpyNDArray(self._data.T)
+
+    def reverse_rows(self) -> "NumpyNDArray":
+        return NumpyNDArray(self._data[:, ::-1])
+
+    def reverse_cols(self) -> "NumpyNDArray":
+        return NumpyNDArray(self._data[::-1, :])
+
+    def flip(self) -> "NumpyNDArray":
+        return NumpyNDArray(self._data[::-1, ::-1])
+
+    def rotate_clockwise(self) -> "NumpyNDArray":
+        return NumpyNDArray(np.rot90(self._data, k=-1))
+
+    def rotate_counterclockwise(self) -> "NumpyNDArray":
+        return NumpyNDArray(np.rot90(self._data, k=1))
+
+
+def piecewise_lookup(starts: array, offsets: array, values: array) -> array:
+    """each value plus the offset of the piece it falls in, pieces as in
+    day05's PiecewiseMap. every array is "q"
+    """
+    points = np.frombuffer(values, dtype=np.int64)
+    idx = np.searchsorted(np.frombuffer(starts, dtype=np.int64), points, side="right")
+    mapped = points + np.frombuffer(offsets, dtype=np.int64)[idx - 1]
+    return array("q", mapped.tobytes())
@@ -0,0 +1,235 @@
+import cProfile
+import re
+import resource
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from os import makedirs
+from os.path import basename, join
+from types import FrameType, ModuleType
+from typing import Iterable
+
+from aoc2023 import HOT_PATHS, reset_hot_paths
+from aoc2023.runner import Case, Result, run_case
+
+SAMPLE_INTERVAL = 0.001
+
+
+class StackSampler:
+    """samples one thread's stack on a timer and counts the collapsed stacks,
+    root first and separated by ";", which is the format flamegraph.pl and
+    speedscope both read
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    @staticmethod
+    def collapse(frame: FrameType | None) -> str:
+        names: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            filename = basename(code.co_filename)
+            names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self.collapse(frame)] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+def output_stem(out_dir: str, case: Case) -> str:
+    # case keys hold brackets, commas and spaces, keep filenames plain
+    return join(out_dir, re.sub(r"[^\w.=-]+", "_", case.key).strip("_"))
+
+
+def profile_case(
+    modules: dict[int, ModuleType], case: Case, out_dir: str
+) -> tuple[Result, str]:
+    """runs case under cProfile and the stack sampler at once, writing
+    <stem>.prof for pstats/snakeviz and <stem>.folded for flame graphs. the
+    sampler runs in its own thread so cProfile never sees it, but its samples
+    do include cProfile's overhead
+    """
+    makedirs(out_dir, exist_ok=True)
+    stem = output_stem(out_dir, case)
+
+    reset_hot_paths()
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+
+    sampler.start()
+    profiler.enable()
+    try:
+        result = run_case(modules, case)
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+    profiler.dump_stats(stem + ".prof")
+    sampler.write(stem + ".folded")
+
+    return result, stem
+
+
+def format_hot_paths() -> list[str]:
+    lines: list[str] = []
+    for stats in sorted(HOT_PATHS.values(), key=lambda s: s.seconds, reverse=True):
+        if stats.calls:
+            per_call = 1e6 * stats.seconds / stats.calls
+            lines.append(
+                f"  {stats.name:<32} {stats.calls:>12} calls "
+                f"{stats.seconds:>9.4f}s {per_call:>9.2f}us/call"
+            )
+    return lines
+
+
+MEMORY_POLL_INTERVAL = 0.01
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    result: Result
+    peak: int
+    rss_growth: int
+    sites: tuple[AllocationSite, ...]
+
+
+class PeakSnapshotter:
+    """the snapshot at the end of a part only shows what it kept, so poll
+    the traced memory and snapshot again whenever it has grown past the last
+    snapshot by a margin. the last snapshot taken is then close to the peak
+    """
+
+    def __init__(self, interval: float = MEMORY_POLL_INTERVAL, growth: float = 1.1):
+        self.interval = interval
+        self.growth = growth
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._size * self.growth:
+                self.snapshot = tracemalloc.take_snapshot()
+                self._size = current
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def peak_rss() -> int:
+    # ru_maxrss is in kilobytes on linux but bytes on macos
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, top: int) -> tuple[AllocationSite, ...]:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+    )
+    sites: list[AllocationSite] = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        sites.append(
+            AllocationSite(frame.filename, frame.lineno, stat.size, stat.count)
+        )
+    return tuple(sites)
+
+
+def measure_memory(
+    modules: dict[int, ModuleType], case: Case, top: int = 5
+) -> MemoryReport:
+    """runs case with tracemalloc on, which slows it down a few times over.
+    rss_growth is how far the part pushed the process's peak rss up, so it's
+    0 when an earlier part already went higher
+    """
+    rss = peak_rss()
+    snapshotter = PeakSnapshotter()
+
+    tracemalloc.start()
+    snapshotter.start()
+    try:
+        result = run_case(modules, case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        snapshotter.stop()
+        # short parts can finish before the first poll
+        snapshot = snapshotter.snapshot or tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    return MemoryReport(result, peak, peak_rss() - rss, top_sites(snapshot, top))
+
+
+def parse_budgets(values: Iterable[str] | None) -> dict[str, int]:
+    """budgets are in megabytes, either bare ("200") for every part or
+    scoped to a part or a single case ("day21.part2=500")
+    """
+    budgets: dict[str, int] = {}
+    for value in values or ():
+        name, _, mb = value.rpartition("=")
+        budgets[name] = int(float(mb) * 2**20)
+    return budgets
+
+
+def get_budget(budgets: dict[str, int], case: Case) -> int | None:
+    for name in (case.key, case.name, ""):
+        if name in budgets:
+            return budgets[name]
+    return None
+
+
+def format_memory(report: MemoryReport, budget: int | None) -> list[str]:
+    status = ""
+    if budget is not None and report.peak > budget:
+        status = f"  OVER BUDGET (limit {budget / 2**20:.2f} MB)"
+
+    lines = [
+        f"  peak {report.peak / 2**20:.2f} MB traced, "
+        f"rss peak +{report.rss_growth / 2**20:.2f} MB{status}"
+    ]
+    for site in report.sites:
+        lines.append(
+            f"  {site.size / 2**20:>9.2f} MB {site.count:>9} blocks  "
+            f"{basename(site.filename)}:{site.lineno}"
+        )
+    return lines
@@ -0,0 +1,283 @@
+import json
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from importlib import import_module
+from io import StringIO
+from math import inf
+from os.path import dirname, exists, join, pardir
+from pkgutil import iter_modules
+from time import perf_counter, process_time
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator
+
+import aoc2023
+from aoc2023 import cache
+
+DAY_MODULE = re.compile(r"^day(\d\d)$")
+TIMINGS_FILE = join(dirname(__file__), pardir, ".timings.json")
+
+
+@dataclass(frozen=True)
+class Case:
+    day: int
+    part: int
+    args: tuple[Any, ...]
+    expected: int | None = None
+    sample: bool | None = None
+
+    def __post_init__(self) -> None:
+        if self.sample is None:
+            sample = isinstance(self.args[0], str) and "sample" in self.args[0]
+            object.__setattr__(self, "sample", sample)
+
+    @property
+    def name(self) -> str:
+        return f"day{self.day:02}.part{self.part}"
+
+    @property
+    def label(self) -> str:
+        # most parts take a filename first, day06.part2 takes the race directly
+        if isinstance(self.args[0], str):
+            return ", ".join(map(str, self.args))
+        return "(" + ", ".join(map(str, self.args)) + ")"
+
+    @property
+    def key(self) -> str:
+        # unique per case, used to line up saved timings between runs
+        return f"{self.name}[{self.label}]"
+
+
+@dataclass(frozen=True)
+class Result:
+    case: Case
+    wall: float
+    cpu: float
+    answer: Any
+
+    @property
+    def ok(self) -> bool:
+        return self.case.expected is None or self.answer == self.case.expected
+
+
+# mirrors the asserts in each day's `if __name__ == "__main__"` block,
+# expected=None marks the inspection-only parts that don't return an answer
+CASES: tuple[Case, ...] = (
+    Case(1, 1, ("day01_part1_sample.txt",), 142),
+    Case(1, 1, ("day01.txt",), 54968),
+    Case(1, 2, ("day01_part2_sample.txt",), 281),
+    Case(1, 2, ("day01.txt",), 54094),
+    Case(2, 1, ("day02_sample.txt",), 8),
+    Case(2, 1, ("day02.txt",), 2256),
+    Case(2, 2, ("day02_sample.txt",), 2286),
+    Case(2, 2, ("day02.txt",), 74229),
+    Case(3, 1, ("day03_sample.txt",), 4361),
+    Case(3, 1, ("day03.txt",), 537832),
+    Case(3, 2, ("day03_sample.txt",), 467835),
+    Case(3, 2, ("day03.txt",), 81939900),
+    Case(4, 1, ("day04_sample.txt",), 13),
+    Case(4, 1, ("day04.txt",), 23678),
+    Case(4, 2, ("day04_sample.txt",), 30),
+    Case(4, 2, ("day04.txt",), 15455663),
+    Case(5, 1, ("day05_sample.txt",), 35),
+    Case(5, 1, ("day05.txt",), 424490994),
+    Case(5, 2, ("day05_sample.txt",), 46),
+    Case(5, 2, ("day05.txt",), 15290096),
+    Case(6, 1, ("day06_sample.txt",), 288),
+    Case(6, 1, ("day06.txt",), 6209190),
+    Case(6, 2, (71530, 940200), 71503, sample=True),
+    Case(6, 2, (40929790, 215106415051100), 28545089),
+    Case(7, 1, ("day07_sample.txt",), 6440),
+    Case(7, 1, ("day07.txt",), 251029473),
+    Case(7, 2, ("day07_sample.txt",), 5905),
+    Case(7, 2, ("day07.txt",), 251003917),
+    Case(8, 1, ("day08_sample1.txt",), 2),
+    Case(8, 1, ("day08_sample2.txt",), 6),
+    Case(8, 1, ("day08.txt",), 19241),
+    Case(8, 2, ("day08_sample3.txt",), 6),
+    Case(8, 2, ("day08.txt",), 9606140307013),
+    Case(9, 1, ("day09_sample.txt",), 114),
+    Case(9, 1, ("day09.txt",), 1953784198),
+    Case(9, 2, ("day09_sample.txt",), 2),
+    Case(9, 2, ("day09.txt",), 957),
+    Case(10, 1, ("day10_sample1.txt", "F"), 4),
+    Case(10, 1, ("day10_sample2.txt", "F"), 8),
+    Case(10, 1, ("day10.txt", "|"), 6786),
+    Case(10, 2, ("day10_sample1.txt", "F"), 1),
+    Case(10, 2, ("day10_sample2.txt", "F"), 1),
+    Case(10, 2, ("day10_sample3.txt", "F"), 4),
+    Case(10, 2, ("day10_sample4.txt", "F"), 4),
+    Case(10, 2, ("day10_sample5.txt", "F"), 8),
+    Case(10, 2, ("day10_sample6.txt", "7"), 10),
+    Case(10, 2, ("day10.txt", "|"), 495),
+    Case(11, 1, ("day11_sample.txt",), 374),
+    Case(11, 1, ("day11.txt",), 9693756),
+    Case(11, 2, ("day11_sample.txt", 10), 1030),
+    Case(11, 2, ("day11_sample.txt", 100), 8410),
+    Case(11, 2, ("day11.txt", int(1e6)), 717878258016),
+    Case(12, 1, ("day12_sample.txt",), 21),
+    Case(12, 1, ("day12.txt",), 7191),
+    Case(12, 2, ("day12_sample.txt",), 525152),
+    Case(12, 2, ("day12.txt",), 6512849198636),
+    Case(13, 1, ("day13_sample.txt",), 405),
+    Case(13, 1, ("day13.txt",), 31265),
+    Case(13, 2, ("day13_sample.txt",), 400),
+    Case(13, 2, ("day13.txt",), 39359),
+    Case(14, 1, ("day14_sample.txt",), 136),
+    Case(14, 1, ("day14.txt",), 112046),
+    Case(14, 2, ("day14_sample.txt",)),
+    Case(14, 2, ("day14.txt",)),
+    Case(15, 1, ("day15_sample.txt",), 1320),
+    Case(15, 1, ("day15.txt",), 494980),
+    Case(15, 2, ("day15_sample.txt",), 145),
+    Case(15, 2, ("day15.txt",), 247933),
+    Case(16, 1, ("day16_sample.txt", 0, 1), 46),
+    Case(16, 1, ("day16.txt", 0, 2), 7798),
+    Case(16, 2, ("day16_sample.txt",), 51),
+    Case(16, 2, ("day16.txt",), 8026),
+    Case(17, 1, ("day17_sample.txt",), 102),
+    Case(17, 1, ("day17.txt",), 1128),
+    Case(17, 2, ("day17_sample.txt",), 94),
+    Case(17, 2, ("day17_sample2.txt",), 71),
+    Case(17, 2, ("day17.txt",), 1268),
+    Case(18, 1, ("day18_sample.txt",), 62),
+    Case(18, 1, ("day18.txt",), 68115),
+    Case(18, 2, ("day18_sample.txt",), 952408144115),
+    Case(18, 2, ("day18.txt",), 71262565063800),
+    Case(19, 1, ("day19_sample.txt",), 19114),
+    Case(19, 1, ("day19.txt",), 397061),
+    Case(19, 2, ("day19_sample.txt",), 167409079868000),
+    Case(19, 2, ("day19.txt",), 125657431183201),
+    Case(20, 1, ("day20_sample1.txt",), 32000000),
+    Case(20, 1, ("day20_sample2.txt",), 11687500),
+    Case(20, 1, ("day20.txt",), 912199500),
+    Case(20, 2, ("day20.txt",)),
+    Case(21, 1, ("day21_sample.txt", 6), 16),
+    Case(21, 1, ("day21.txt", 64), 3788),
+    Case(21, 1, ("day21_sample.txt", 10), 50),
+    Case(21, 1, ("day21_sample.txt", 50), 1594),
+    Case(21, 1, ("day21_sample.txt", 100), 6536),
+    Case(21, 1, ("day21_sample.txt", 500), 167004),
+    Case(21, 2, ("day21.txt", 26501365), 631357596621921),
+)
+
+
+def discover() -> dict[int, ModuleType]:
+    days: dict[int, ModuleType] = {}
+    for module in iter_modules(aoc2023.__path__):
+        match = DAY_MODULE.match(module.name)
+        if match is not None:
+            days[int(match.group(1))] = import_module(f"aoc2023.{module.name}")
+    return dict(sorted(days.items()))
+
+
+def select(
+    cases: Iterable[Case],
+    days: Iterable[int] | None = None,
+    parts: Iterable[int] | None = None,
+    sample: bool | None = None,
+) -> list[Case]:
+    days = None if days is None else set(days)
+    parts = None if parts is None else set(parts)
+
+    selected: list[Case] = []
+    for case in cases:
+        if days is not None and case.day not in days:
+            continue
+        if parts is not None and case.part not in parts:
+            continue
+        if sample is not None and case.sample != sample:
+            continue
+        selected.append(case)
+    return selected
+
+
+def get_part(modules: dict[int, ModuleType], case: Case) -> Callable[..., Any]:
+    return getattr(modules[case.day], f"part{case.part}")
+
+
+def run_case(modules: dict[int, ModuleType], case: Case) -> Result:
+    fn = get_part(modules, case)
+
+    # the inspection parts print their progress, keep it out of the report
+    with redirect_stdout(StringIO()):
+        wall, cpu = perf_counter(), process_time()
+        answer = fn(*case.args)
+        wall, cpu = perf_counter() - wall, process_time() - cpu
+
+    return Result(case, wall, cpu, answer)
+
+
+def run(modules: dict[int, ModuleType], cases: Iterable[Case]) -> Iterator[Result]:
+    for case in cases:
+        yield run_case(modules, case)
+
+
+def load_timings(path: str = TIMINGS_FILE) -> dict[str, float]:
+    if not exists(path):
+        return {}
+    with open(path, "r") as fh:
+        return json.load(fh)
+
+
+def save_timings(results: Iterable[Result], path: str = TIMINGS_FILE) -> None:
+    # merge so that a filtered run doesn't forget the other days. cpu time
+    # is kept since wall time is inflated when the pool is oversubscribed
+    timings = load_timings(path)
+    timings.update({result.case.key: result.cpu for result in results})
+    with open(path, "w") as fh:
+        json.dump(dict(sorted(timings.items())), fh, indent=2)
+        fh.write("\n")
+
+
+def longest_first(cases: Iterable[Case], timings: dict[str, float]) -> list[Case]:
+    # cases that have never been timed might be slow, so start them first
+    return sorted(cases, key=lambda case: timings.get(case.key, inf), reverse=True)
+
+
+_worker_modules: dict[int, ModuleType] = {}
+
+
+def _init_worker(cache_settings: tuple[bool, str | None], backend: str) -> None:
+    cache.configure(*cache_settings)
+    aoc2023.set_backend(backend)
+    _worker_modules.update(discover())
+
+
+def _run_in_worker(case: Case) -> Result:
+    return run_case(_worker_modules, case)
+
+
+def run_parallel(
+    cases: Iterable[Case], jobs: int, timings: dict[str, float] | None = None
+) -> Iterator[Result]:
+    """submits the slowest cases first so the pool drains evenly, but yields
+    results in the order the cases were given
+    """
+    cases = list(cases)
+    futures: dict[Case, Future[Result]] = {}
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(cache.settings(), aoc2023.get_backend()),
+    ) as pool:
+        for case in longest_first(cases, timings or {}):
+            futures[case] = pool.submit(_run_in_worker, case)
+
+        for case in cases:
+            yield futures[case].result()
+
+
+def format_result(result: Result) -> str:
+    case = result.case
+    status = "ok" if result.ok else f"FAIL (expected {case.expected})"
+    return (
+        f"{case.name:<12} {case.label:<28} "
+        f"{result.wall:>9.4f} {result.cpu:>9.4f}  {result.answer!s:<18} {status}"
+    )
+
+
+def format_header() -> str:
+    return f"{'part':<12} {'input':<28} {'wall (s)':>9} {'cpu (s)':>9}  {'answer':<18}"